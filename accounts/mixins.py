@@ -0,0 +1,38 @@
+from django.contrib.auth.mixins import PermissionRequiredMixin
+from .roles import has_group
+
+
+class ObjectPermissionMixin(PermissionRequiredMixin):
+    """
+    PermissionRequiredMixin for views that act on one object (UpdateView,
+    DeleteView). After the model permission, the role and ownership rules are
+    checked against the object itself.
+
+    The object is fetched once per request: has_permission() loads it, and
+    get(), post() and the form receive that same instance. Editors may act on
+    any object; journalists only on objects whose `owner_field` points at them.
+    """
+    owner_field = 'journalist'
+    manager_groups = ('Editor',)
+    owner_groups = ('Journalist',)
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object(queryset)
+        return self._object
+
+    def is_owner(self, user, obj):
+        # Compares the foreign key column, so the owner row is never loaded.
+        return getattr(obj, self.model._meta.get_field(self.owner_field).attname) == user.pk
+
+    def has_object_permission(self, user, obj):
+        if any(has_group(user, group) for group in self.manager_groups):
+            return True
+        if any(has_group(user, group) for group in self.owner_groups):
+            return self.is_owner(user, obj)
+        return False
+
+    def has_permission(self):
+        if not super().has_permission():
+            return False
+        return self.has_object_permission(self.request.user, self.get_object())
@@ -1,8 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import Group, Permission
 from django.apps import apps
 from .models import CustomUser
+from .roles import invalidate_roles
 
 
 @receiver(post_save, sender=CustomUser)
@@ -53,4 +54,30 @@ def assign_permissions_to_group(group, codename_list):
             )
             group.permissions.add(permission)
         except Permission.DoesNotExist:
-            pass 
\ No newline at end of file
+            pass 
+
+
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+@receiver(m2m_changed, sender=CustomUser.user_permissions.through)
+def invalidate_user_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_roles([instance.pk])
+    elif action == 'post_clear' or pk_set is None:
+        invalidate_roles()
+    else:
+        invalidate_roles(pk_set)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_roles(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate_roles()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def invalidate_deleted_roles(sender, **kwargs):
+    # Deleting a group or permission removes its through rows without m2m_changed.
+    invalidate_roles()
@@ -0,0 +1,113 @@
+"""
+Role resolution: a user's group names and permissions are loaded once and then
+answered from memory.
+
+They are memoized on the user object for the rest of the request and, through
+RoleCacheMiddleware, kept in the session for later requests. A version token
+in the cache, replaced whenever a user's groups/permissions or any group's
+permissions change, invalidates the session copy.
+"""
+import uuid
+from django.core.cache import cache
+
+
+SESSION_KEY = '_roles'
+USER_VERSION_KEY = 'accounts:roles:{}'
+GLOBAL_VERSION_KEY = 'accounts:roles'
+
+
+class UserRoles:
+    """
+    The group names and 'app_label.codename' permissions of a user. Permissions
+    are only needed by has_perm() checks, so they stay None until first asked for.
+    """
+
+    def __init__(self, groups=(), permissions=None):
+        self.groups = frozenset(groups)
+        self.permissions = None if permissions is None else frozenset(permissions)
+
+    def to_session(self, version):
+        permissions = None if self.permissions is None else sorted(self.permissions)
+        return {'version': version, 'groups': sorted(self.groups), 'permissions': permissions}
+
+
+NO_ROLES = UserRoles(permissions=())
+
+
+def _version_token(key):
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        token = cache.get(key)
+    return token
+
+
+def roles_version(user_id):
+    """Token identifying the current state of the user's roles."""
+    return f'{_version_token(GLOBAL_VERSION_KEY)}:{_version_token(USER_VERSION_KEY.format(user_id))}'
+
+
+def invalidate_roles(user_ids=None):
+    """Drop cached roles of `user_ids`, or of every user when it is None."""
+    if user_ids is None:
+        cache.set(GLOBAL_VERSION_KEY, uuid.uuid4().hex, None)
+    else:
+        cache.set_many({USER_VERSION_KEY.format(pk): uuid.uuid4().hex for pk in user_ids}, None)
+
+
+def load_roles(user):
+    return UserRoles(user.groups.values_list('name', flat=True))
+
+
+def remember_roles(user, roles):
+    """Attach `roles` to `user` so checks and has_perm() make no further queries."""
+    user._roles = roles
+    if roles.permissions is not None:
+        user._perm_cache = set(roles.permissions)
+
+
+def get_roles(user):
+    if not user.is_authenticated:
+        return NO_ROLES
+    roles = getattr(user, '_roles', None)
+    if roles is None:
+        roles = load_roles(user)
+        remember_roles(user, roles)
+    return roles
+
+
+def has_group(user, name):
+    return name in get_roles(user).groups
+
+
+class RoleCacheMiddleware:
+    """
+    Restore the user's roles from the session, and store them there after a
+    request that had to load (part of) them. Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = request.user
+        version = cached = None
+        if user.is_authenticated:
+            version = roles_version(user.pk)
+            cached = request.session.get(SESSION_KEY)
+            if cached and cached['version'] == version:
+                remember_roles(user, UserRoles(cached['groups'], cached['permissions']))
+
+        response = self.get_response(request)
+
+        # Stored with the version read before they were loaded, so a change made
+        # during this request invalidates them on the next one.
+        roles = getattr(user, '_roles', None) if version else None
+        if roles is not None and request.user.pk == user.pk:
+            if roles.permissions is None and hasattr(user, '_perm_cache'):
+                # Loaded by ModelBackend for a has_perm() check during the view.
+                roles.permissions = frozenset(user._perm_cache)
+            stored = roles.to_session(version)
+            if stored != cached:
+                request.session[SESSION_KEY] = stored
+        return response
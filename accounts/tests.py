@@ -1,3 +1,37 @@
-from django.test import TestCase
+from django.contrib.auth.models import Group
+from django.test import RequestFactory, TestCase
+from .models import CustomUser
+from .roles import RoleCacheMiddleware, has_group
+
 
 # Create your tests here.
+class RoleCacheMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('reader', password='pass', position='reader')
+        self.editors = Group.objects.create(name='Editor')
+        self.session = {}
+
+    def is_editor(self):
+        """Run a request through RoleCacheMiddleware with the same session, as a new user object."""
+        request = RequestFactory().get('/')
+        request.user = CustomUser.objects.get(pk=self.user.pk)
+        request.session = self.session
+        return RoleCacheMiddleware(lambda request: has_group(request.user, 'Editor'))(request)
+
+    def test_roles_are_served_from_the_session(self):
+        self.assertFalse(self.is_editor())
+        with self.assertNumQueries(1):  # the user; the groups come from the session
+            self.assertFalse(self.is_editor())
+
+    def test_membership_change_invalidates_the_session_copy(self):
+        self.assertFalse(self.is_editor())
+        self.user.groups.add(self.editors)
+        self.assertTrue(self.is_editor())
+        self.editors.custom_user_set.remove(self.user)
+        self.assertFalse(self.is_editor())
+
+    def test_deleted_group_invalidates_the_session_copy(self):
+        self.user.groups.add(self.editors)
+        self.assertTrue(self.is_editor())
+        self.editors.delete()
+        self.assertFalse(self.is_editor())
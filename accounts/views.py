@@ -18,6 +18,7 @@ from django.contrib.auth.forms import SetPasswordForm
 import secrets
 from hashlib import sha1
 from .models import ResetToken
+from hyper_news.pagination import cached_page
 
 User = get_user_model()
 
@@ -26,13 +27,19 @@ User = get_user_model()
 def home_view(request):
     """
     Render the home page view.
+    Articles and newsletters are keyset paginated independently through the
+    `articles_cursor` and `newsletters_cursor` query parameters.
     """
     
-    articles = Article.objects.all()
-    newsletters = Newsletter.objects.all()
+    articles = cached_page('home:articles', [Article], Article.objects.cards(),
+                           request.GET.get('articles_cursor'))
+    newsletters = cached_page('home:newsletters', [Newsletter], Newsletter.objects.cards(),
+                              request.GET.get('newsletters_cursor'))
     context = {
-        'articles': articles,
-        'newsletters': newsletters
+        'articles': articles.object_list,
+        'newsletters': newsletters.object_list,
+        'articles_next_cursor': articles.next_cursor,
+        'newsletters_next_cursor': newsletters.next_cursor,
     }
     return render(request, 'accounts/home.html', context)
 
@@ -0,0 +1,72 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from accounts.models import CustomUser
+from article.models import Article
+from article.serializers import ArticleListSerializer, ArticleSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Compare ArticleSerializer with the values()-based ArticleListSerializer on '
+            'a list of generated articles. The rows are created in a transaction that '
+            'is rolled back afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000,
+                            help='Number of articles to serialize.')
+        parser.add_argument('--editors', type=int, default=2,
+                            help='Editors per article.')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per serializer; the fastest is reported.')
+
+    def populate(self, rows, editors):
+        journalist = CustomUser.objects.create(username='benchmark-journalist', position='journalist')
+        staff = CustomUser.objects.bulk_create(
+            [CustomUser(username=f'benchmark-editor-{i}', position='editor') for i in range(editors)])
+        Article.objects.bulk_create(
+            [Article(title=f'Article {i}', description='Benchmark article', content='Lorem ipsum ' * 40,
+                     publisher=journalist, journalist=journalist) for i in range(rows)],
+            batch_size=1000)
+        queryset = Article.objects.filter(publisher=journalist)
+        Article.editors.through.objects.bulk_create(
+            [Article.editors.through(article_id=pk, customuser_id=editor.pk)
+             for pk in queryset.values_list('pk', flat=True) for editor in staff],
+            batch_size=1000)
+        return queryset
+
+    def run(self, serializer_class, queryset, repeat):
+        best = None
+        for _ in range(repeat):
+            queries = []
+
+            def count(execute, sql, params, many, context):
+                queries.append(sql)
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(count):
+                start = time.perf_counter()
+                data = serializer_class(queryset.order_by('id'), many=True).data
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return data, best, len(queries)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                queryset = self.populate(options['rows'], options['editors'])
+                reference, reference_time, reference_queries = self.run(ArticleSerializer, queryset, options['repeat'])
+                fast, fast_time, fast_queries = self.run(ArticleListSerializer, queryset, options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        rows = len(reference)
+        self.stdout.write(f'Articles:              {rows} x {options["editors"]} editors')
+        self.stdout.write(f'ArticleSerializer:     {rows / reference_time:,.0f} rows/s ({reference_queries} queries)')
+        self.stdout.write(f'ArticleListSerializer: {rows / fast_time:,.0f} rows/s ({fast_queries} queries)')
+        self.stdout.write(f'Speedup:               {reference_time / fast_time:.1f}x')
+        self.stdout.write(f'Identical output:      {[dict(row) for row in reference] == list(fast)}')
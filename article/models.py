@@ -1,5 +1,6 @@
 from django.db import models
 from accounts.models import CustomUser
+from hyper_news.models import DirtyFieldsMixin
 # from django.contrib.auth.models import User
 from django.contrib.auth import get_user_model
 
@@ -22,7 +23,16 @@ class Publisher(models.Model):
         return f"name:{self.name}"
     
 
-class Article(models.Model):
+class ArticleQuerySet(models.QuerySet):
+    def cards(self):
+        """Only load the columns the article card templates render (no `content`)."""
+        return self.select_related('journalist', 'publisher').only(
+            'id', 'title', 'description', 'image', 'created_at', 'updated_at',
+            'journalist__username', 'publisher__username',
+        )
+
+
+class Article(DirtyFieldsMixin, models.Model):
     """Model representing an article in the system."""
     title = models.CharField(max_length=200)
     description = models.CharField(max_length=500)
@@ -41,22 +51,23 @@ class Article(models.Model):
                                      limit_choices_to={'position': 'editor'}, 
                                      related_name='article_editors')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last save; versions the cached card fragments of the list templates
+    updated_at = models.DateTimeField(auto_now=True)
     approved = models.BooleanField(default=False)
     sentiment = models.CharField(max_length=20, default='Neutral')
     likes = models.ManyToManyField(User, related_name='article_likes', blank=True)
     dislikes = models.ManyToManyField(User, related_name='article_dislikes', blank=True)
+    # Denormalized sizes of `likes` / `dislikes`, maintained by comment.reactions
+    likes_count = models.PositiveIntegerField(default=0)
+    dislikes_count = models.PositiveIntegerField(default=0)
+
+    objects = ArticleQuerySet.as_manager()
+    # The pre_save sentiment hook derives `sentiment` from `content`
+    dirty_dependencies = {'content': ['sentiment']}
 
     def __str__(self):
         return f"title:{self.title}, journalist:{self.journalist}"
     
-    @property
-    def likes_count(self):
-        return self.likes.count()
-
-    @property
-    def dislikes_count(self):
-        return self.dislikes.count()
-    
     class Meta:
         permissions = (
             ('article_create', 'Can create article'),
@@ -64,6 +75,10 @@ class Article(models.Model):
             ('article_update', 'Can update article'),
             ('article_delete', 'Can delete article'),
         )
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='article_created_id_idx'),
+            models.Index(fields=['sentiment'], name='article_sentiment_idx'),
+        ]
     
 
 
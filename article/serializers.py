@@ -1,4 +1,8 @@
+from collections import defaultdict
+from django.utils.functional import cached_property
 from rest_framework import serializers
+from hyper_news.fields import NativeDateTimeField
+from hyper_news.serializers import ExpandableFieldsMixin
 from .models import Article, Publisher
 from newsletter.models import Newsletter
 from accounts.models import CustomUser
@@ -28,7 +32,7 @@ class JournalistSerializer(serializers.ModelSerializer):
                   'last_name']
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     
     journalist = serializers.PrimaryKeyRelatedField(
         many=False,
@@ -40,6 +44,12 @@ class ArticleSerializer(serializers.ModelSerializer):
         queryset=CustomUser.objects.filter(position='editor'),
         required=True
     )
+    created_at = NativeDateTimeField(read_only=True)
+    expandable_fields = {
+        'publisher': JournalistSerializer,
+        'journalist': JournalistSerializer,
+        'editors': JournalistSerializer,
+    }
     
     class Meta:
         model = Article
@@ -54,9 +64,86 @@ class ArticleSerializer(serializers.ModelSerializer):
         # extra_kwargs = {
         #     'journalist': {'required': False}
         # }
-        
 
-class NewsletterSerializer(serializers.ModelSerializer):
+
+class ArticleListRowsSerializer(serializers.ListSerializer):
+    """
+    Builds the rows of an article queryset from values() and a single query on
+    the editors through table, instead of model instances and one M2M query each.
+    Only the requested columns are selected, and expanded users are joined into
+    the same queries.
+    """
+
+    def to_representation(self, data):
+        names, expand = self.child.selection
+        user_fields = JournalistSerializer.Meta.fields
+        columns = ['id']
+        for name in names:
+            if name in expand and name != 'editors':
+                columns.extend(f'{name}__{user_field}' for user_field in user_fields)
+            elif name in ArticleListSerializer.columns and name != 'id':
+                columns.append(name)
+        rows = list(data.values(*columns))
+        if 'editors' in names:
+            expanded = 'editors' in expand
+            editor_columns = [f'customuser__{user_field}' for user_field in user_fields] if expanded else ['customuser_id']
+            through = Article.editors.through
+            editors = defaultdict(list)
+            for article_id, *editor in (through.objects
+                                        .filter(article_id__in=[row['id'] for row in rows])
+                                        .order_by('id')
+                                        .values_list('article_id', *editor_columns)):
+                editors[article_id].append(dict(zip(user_fields, editor)) if expanded else editor[0])
+            for row in rows:
+                row['editors'] = editors[row['id']]
+        return [self.child.to_representation(row) for row in rows]
+
+
+class ArticleListSerializer(serializers.BaseSerializer):
+    """
+    Read-only list representation of ArticleSerializer, with the same output,
+    `?fields=` and `?expand=` included. Only usable with many=True on an Article queryset.
+    """
+    columns = ('id', 'title', 'content', 'publisher', 'journalist', 'created_at')
+
+    class Meta:
+        list_serializer_class = ArticleListRowsSerializer
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = NativeDateTimeField()
+        self.created_at.bind('created_at', self)
+
+    @classmethod
+    def prepare_queryset(cls, queryset, context):
+        # The columns are picked by ArticleListRowsSerializer.
+        return queryset
+
+    @cached_property
+    def selection(self):
+        return ArticleSerializer.selected(self.context)
+
+    def to_representation(self, row):
+        names, expand = self.selection
+        data = {}
+        for name in names:
+            if name in expand and name != 'editors':
+                user = {user_field: row[f'{name}__{user_field}'] for user_field in JournalistSerializer.Meta.fields}
+                data[name] = user if user['id'] is not None else None
+            elif name == 'created_at':
+                data[name] = self.created_at.to_representation(row[name])
+            else:
+                data[name] = row[name]
+        return data
+
+
+class NewsletterSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    created_at = NativeDateTimeField(read_only=True)
+    expandable_fields = {
+        'publisher': JournalistSerializer,
+        'journalist': JournalistSerializer,
+    }
+
     class Meta:
         model = Newsletter
         fields = ['id', 
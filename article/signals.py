@@ -1,20 +1,37 @@
-from django.db.models.signals import pre_save
-from django.dispatch import receiver
-from textblob import TextBlob
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import Signal, receiver
+from hyper_news.cache import track
+from sentiment.analysis import queue_sentiment
 from .models import Article
 
 
+# Sent once an article has been approved and the approval is committed, with `article`.
+article_approved = Signal()
+# Sent once an approved article has been withdrawn from approval and that is committed.
+article_unapproved = Signal()
+
+track(Article)
+
+
+@receiver(pre_save, sender=Article)
+def analyze_sentiment(sender, instance, update_fields=None, **kwargs):
+    """Queue the article for background sentiment analysis (see `manage.py process_sentiment`)."""
+    queue_sentiment(instance, update_fields)
+
+
 @receiver(pre_save, sender=Article)
-def analyze_sentiment(sender, instance, **kwargs):
-    if instance.content:
-        analysis = TextBlob(instance.content)
-        polarity = analysis.sentiment.polarity  # ranges from -1 to 1
-
-        if polarity > 0.1:
-            instance.sentiment = "Positive"
-        elif polarity < -0.1:
-            instance.sentiment = "Negative"
-        else:
-            instance.sentiment = "Neutral"
-    else:
-        instance.sentiment = "Neutral"
+def track_approval(sender, instance, update_fields=None, **kwargs):
+    changed = (update_fields is None or 'approved' in update_fields) and instance.is_dirty('approved')
+    instance._approving = changed and instance.approved
+    instance._unapproving = changed and not instance.approved and not instance._state.adding
+
+
+@receiver(post_save, sender=Article)
+def send_article_approved(sender, instance, **kwargs):
+    if getattr(instance, '_approving', False):
+        instance._approving = False
+        transaction.on_commit(lambda: article_approved.send(sender=Article, article=instance))
+    elif getattr(instance, '_unapproving', False):
+        instance._unapproving = False
+        transaction.on_commit(lambda: article_unapproved.send(sender=Article, article=instance))
@@ -1,18 +1,19 @@
 from django import template
+from accounts.roles import has_group
 
 register = template.Library()
 
 
 @register.filter(name='journalist_pem')
 def journalist_pem(user):
-    return user.groups.filter(name='Journalist').exists()
+    return has_group(user, 'Journalist')
 
 
 @register.filter(name='editor_pem')
 def editor_pem(user):
-    return user.groups.filter(name='Editor').exists()
+    return has_group(user, 'Editor')
 
 
 @register.filter(name='reader_pem')
 def reader_pem(user):
-    return user.groups.filter(name='Reader').exists()
\ No newline at end of file
+    return has_group(user, 'Reader')
@@ -1,3 +1,34 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from accounts.models import CustomUser
+from .models import Article
+
 
 # Create your tests here.
+class ArticleUpdateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.journalist = CustomUser.objects.create_user('journalist', password='pass', position='journalist')
+        self.journalist.groups.add(Group.objects.get_or_create(name='Journalist')[0])
+        self.journalist.user_permissions.add(Permission.objects.get(codename='article_update'))
+        self.article = Article.objects.create(title='Title', description='d', content='c',
+                                              publisher=self.journalist, journalist=self.journalist,
+                                              approved=True)
+        self.client.force_login(self.journalist)
+        self.url = reverse('article_update', args=[self.article.pk])
+
+    def post(self, **changes):
+        data = {'title': 'Title', 'description': 'd', 'content': 'c', **changes}
+        self.assertEqual(self.client.post(self.url, data).status_code, 302)
+        self.article.refresh_from_db()
+
+    def test_edit_sends_approved_article_back_for_review(self):
+        self.post(title='New title')
+        self.assertEqual(self.article.title, 'New title')
+        self.assertFalse(self.article.approved)
+
+    def test_unchanged_article_stays_approved(self):
+        self.post()
+        self.assertTrue(self.article.approved)
@@ -1,21 +1,25 @@
 from django.shortcuts import get_object_or_404, redirect
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from rest_framework.generics import RetrieveUpdateAPIView, CreateAPIView, DestroyAPIView
 from .models import Article
 from .forms import ArticleForm
-from reader.models import Subscriptions
-from .serializers import ArticleSerializer
+from .serializers import ArticleListSerializer, ArticleSerializer
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.views.generic import ListView
 from django.views.generic.detail import DetailView
-from accounts.models import CustomUser
+from accounts.mixins import ObjectPermissionMixin
+from accounts.roles import has_group
 from django.contrib import messages
 from django.urls import reverse_lazy, reverse
-from notification.models import Notification
+from notification.pipeline import notify
 from comment.forms import CommentForm
-from comment.models import Comment, Bookmark
+from comment.mixins import ReactionDetailMixin
+from hyper_news.pagination import KeysetPaginationMixin
+from hyper_news.parsers import MessagePackParser
+from hyper_news.renderers import MessagePackRenderer
 
 
 # register = template.Library()
@@ -24,32 +28,33 @@ from comment.models import Comment, Bookmark
 # Create your views here.
 # @register.filter(name='journalist_pem')
 def journalist_pem(user):
-    return user.groups.filter(name='Journalist').exists()
+    return has_group(user, 'Journalist')
 
 
 # @register.filter(name='editor_pem')
 def editor_pem(user):
-    return user.groups.filter(name='Editor').exists()
+    return has_group(user, 'Editor')
 
 
 # @register.filter(name='reader_pem')
 def reader_pem(user):
-    return user.groups.filter(name='Reader').exists()
+    return has_group(user, 'Reader')
 
 
-class Article_View(LoginRequiredMixin, ListView):
-    """View to list all articles."""
+class Article_View(LoginRequiredMixin, KeysetPaginationMixin, ListView):
+    """View to list all articles, one keyset page at a time."""
     model = Article
     template_name = 'article/article_list.html'
     context_object_name = 'articles'
     serializer_class = ArticleSerializer 
     permission_classes = [IsAuthenticated]
+    cache_models = (Article,)
     
     def get_queryset(self):
-        return Article.objects.all()
+        return Article.objects.cards()
     
 
-class Article_Detail(LoginRequiredMixin, DetailView):
+class Article_Detail(LoginRequiredMixin, ReactionDetailMixin, DetailView):
     """View to display details of a specific article."""
     model = Article
     template_name = 'article/article_detail.html'
@@ -57,37 +62,6 @@ class Article_Detail(LoginRequiredMixin, DetailView):
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticated]
     
-    def get_object(self, queryset=None):
-        return get_object_or_404(Article, pk=self.kwargs['pk'])
-    
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        
-        subscriptions = Subscriptions.objects.filter(user=self.request.user).first()
-        subscribed_journalists = subscriptions.journalist.all() if subscriptions else []
-
-        context['subscribed_journalists'] = subscribed_journalists
-        context['comment_form'] = CommentForm()
-        context['comments'] = Comment.objects.filter(article=self.get_object())
-        context['likes'] = self.get_object().likes.count()
-        context['dislikes'] = self.get_object().dislikes.count()
-        context['bookmarked'] = Bookmark.objects.filter(article=self.get_object(), user=self.request.user).exists()
-        context['liked'] = self.get_object().likes.filter(pk=self.request.user.pk).exists()
-        context['disliked'] = self.get_object().dislikes.filter(pk=self.request.user.pk).exists()
-
-        # Support inline comment editing without JavaScript via ?edit_comment=<id>
-        edit_comment_id = self.request.GET.get('edit_comment')
-        if edit_comment_id:
-            try:
-                edit_comment = Comment.objects.get(pk=edit_comment_id, article=self.get_object())
-                if edit_comment.user_id == self.request.user.id:
-                    context['edit_comment_id'] = edit_comment.pk
-                    context['edit_comment_form'] = CommentForm(instance=edit_comment)
-            except Comment.DoesNotExist:
-                pass
-
-        return context
-    
     def post(self, request, *args, **kwargs):
         form = CommentForm(request.POST)
         if form.is_valid():
@@ -95,13 +69,8 @@ class Article_Detail(LoginRequiredMixin, DetailView):
             comment.article = self.get_object()
             comment.user = request.user
             comment.save()
-            Notification.objects.create(
-                recipient=comment.article.journalist,
-                sender=request.user,
-                article=comment.article,
-                notification_type='comment',
-                message=f'{request.user.username} commented on your article: {comment.article.title}'
-            )
+            notify(comment.article.journalist, request.user, 'comment', comment.article,
+                   f'{request.user.username} commented on your article: {comment.article.title}')
             messages.success(request, "Comment added successfully.")
             return redirect('article_detail', pk=self.get_object().pk)
         return self.get(request, *args, **kwargs)
@@ -113,10 +82,18 @@ class Article_View_API(viewsets.ModelViewSet):
     context_object_name = 'articles'
     serializer_class = ArticleSerializer 
     permission_classes = [IsAuthenticated]
+    # MessagePack for clients that pull large batches; JSON stays the default.
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [MessagePackRenderer]
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [MessagePackParser]
     
     def get_queryset(self):
-        return Article.objects.all()
-    
+        return self.get_serializer_class().prepare_queryset(Article.objects.all(), self.get_serializer_context())
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ArticleListSerializer
+        return ArticleSerializer
+
     def get_journalist(self, obj):
         return obj.journalist.username if obj.journalist else None
     
@@ -156,7 +133,7 @@ class Article_Generate(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
         return redirect(self.get_success_url())
 
 
-class Article_Update(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
+class Article_Update(LoginRequiredMixin, ObjectPermissionMixin, UpdateView):
     model = Article
     form_class = ArticleForm
     template_name = 'article/article_form.html'
@@ -164,42 +141,23 @@ class Article_Update(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
     success_url = reverse_lazy('home_view')
     permission_required = 'article.article_update'
 
-    def has_permission(self):
-        user = self.request.user
-        if not super().has_permission():
-            return False
-        article = self.get_object()
-        if editor_pem(user):
-            return True
-        if journalist_pem(user):
-            return article.journalist == user
-        return False
-
     def form_valid(self, form):
-        if journalist_pem(self.request.user) and self.get_object().approved and form.instance.approved:
-            form.instance.is_approved = False
+        # A journalist's edit sends an approved article back for review.
+        article = form.instance
+        if (journalist_pem(self.request.user) and article.saved_value('approved')
+                and article.get_dirty_fields()):
+            article.approved = False
         messages.success(self.request, "Article updated successfully.")
         return super().form_valid(form)
 
 
-class Article_Delete(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+class Article_Delete(LoginRequiredMixin, ObjectPermissionMixin, DeleteView):
     model = Article
     template_name = 'article/article_delete.html'
     context_object_name = 'articles'
     success_url = reverse_lazy('article_list')
     permission_required = 'article.article_delete'
 
-    def has_permission(self):
-        user = self.request.user
-        if not super().has_permission():
-            return False
-        article = self.get_object()
-        if editor_pem(user):
-            return True
-        if journalist_pem(user):
-            return article.journalist == user
-        return False
-
     def form_valid(self, form):
         messages.success(self.request, f"Article '{self.object.title}' deleted successfully.")
         return super().form_valid(form)
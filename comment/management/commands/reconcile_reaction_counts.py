@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from hyper_news.cache import invalidate
+from article.models import Article
+from newsletter.models import Newsletter
+
+
+REACTION_FIELDS = ('likes', 'dislikes')
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized likes/dislikes counters of articles and newsletters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of rows reconciled per batch.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in (Article, Newsletter):
+            scanned, fixed = self.reconcile(model, batch_size)
+            self.stdout.write(self.style.SUCCESS(
+                f'{model.__name__}: scanned {scanned} rows, fixed {fixed} drifted counters.'
+            ))
+
+    def reconcile(self, model, batch_size):
+        scanned = fixed = 0
+        last_pk = 0
+        count_fields = [f'{name}_count' for name in REACTION_FIELDS]
+
+        while True:
+            rows = list(model.objects.filter(pk__gt=last_pk)
+                        .order_by('pk')
+                        .only('pk', *count_fields)[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+            pks = [row.pk for row in rows]
+            actual = {name: self.count_reactions(model, name, pks) for name in REACTION_FIELDS}
+
+            drifted = []
+            for row in rows:
+                changed = False
+                for name in REACTION_FIELDS:
+                    expected = actual[name].get(row.pk, 0)
+                    if getattr(row, f'{name}_count') != expected:
+                        setattr(row, f'{name}_count', expected)
+                        changed = True
+                if changed:
+                    drifted.append(row)
+
+            if drifted:
+                model.objects.bulk_update(drifted, count_fields)
+                invalidate(model)
+            scanned += len(rows)
+            fixed += len(drifted)
+
+        return scanned, fixed
+
+    def count_reactions(self, model, field_name, pks):
+        """Return {object pk: number of through rows} for one batch of objects."""
+        field = model._meta.get_field(field_name)
+        source = f'{field.m2m_field_name()}_id'
+        counts = (field.remote_field.through.objects
+                  .filter(**{f'{source}__in': pks})
+                  .values(source)
+                  .annotate(total=Count('pk')))
+        return {row[source]: row['total'] for row in counts}
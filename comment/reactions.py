@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models import F
+from hyper_news.cache import invalidate
+
+
+def _through_filter(obj, field_name, user):
+    field = obj._meta.get_field(field_name)
+    through = field.remote_field.through
+    return through, {f'{field.m2m_field_name()}_id': obj.pk,
+                     f'{field.m2m_reverse_field_name()}_id': user.pk}
+
+
+def _remove(obj, field_name, user):
+    """Delete the user's reaction row and return how many rows were actually removed."""
+    through, lookup = _through_filter(obj, field_name, user)
+    removed, _ = through.objects.filter(**lookup).delete()
+    return removed
+
+
+def toggle_reaction(obj, user, field_name, opposite_name):
+    """
+    Toggle `user` in the `field_name` M2M (likes/dislikes) of an Article or Newsletter,
+    clearing the opposite reaction when one is added.
+
+    The denormalized `<field>_count` columns are adjusted with F() expressions by the
+    number of through rows really inserted/deleted, so concurrent toggles cannot make
+    the counters drift. Returns True when the reaction was added.
+    """
+    model = type(obj)
+    count_field = f'{field_name}_count'
+    opposite_count_field = f'{opposite_name}_count'
+
+    with transaction.atomic():
+        invalidate(model)
+        removed = _remove(obj, field_name, user)
+        if removed:
+            model.objects.filter(pk=obj.pk).update(**{count_field: F(count_field) - removed})
+            return False
+
+        through, lookup = _through_filter(obj, field_name, user)
+        _, created = through.objects.get_or_create(**lookup)
+        updates = {count_field: F(count_field) + int(created)}
+        opposite_removed = _remove(obj, opposite_name, user)
+        if opposite_removed:
+            updates[opposite_count_field] = F(opposite_count_field) - opposite_removed
+        model.objects.filter(pk=obj.pk).update(**updates)
+        return True
@@ -0,0 +1,5 @@
+from hyper_news.cache import track
+from .models import Comment
+
+
+track(Comment)
@@ -1,11 +1,13 @@
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from article.models import Article
 from newsletter.models import Newsletter
 from .models import Bookmark
-from notification.models import Notification
+from notification.pipeline import notify, retract
 from comment.forms import CommentForm
 from comment.models import Comment
+from comment.reactions import toggle_reaction
 from django.shortcuts import render
 from django.contrib import messages
 
@@ -23,13 +25,8 @@ def comment_article(request, pk):
             comment.save()
             
             # Create the notification
-            Notification.objects.create(
-                recipient=article.journalist,
-                sender=request.user,
-                article=article,
-                notification_type='comment',
-                message=f'{request.user.username} commented on your article: {article.title}'
-            )
+            notify(article.journalist, request.user, 'comment', article,
+                   f'{request.user.username} commented on your article: {article.title}')
             
             # Redirect to the article detail page after a successful comment
             return redirect('article_detail', pk=pk)
@@ -60,38 +57,26 @@ def comment_article(request, pk):
 @login_required
 def like_article(request, pk):
     article = get_object_or_404(Article, pk=pk)
-    if article.likes.filter(id=request.user.id).exists():
-        article.likes.remove(request.user)
-    else:
-        article.likes.add(request.user)
-        if article.dislikes.filter(id=request.user.id).exists():
-            article.dislikes.remove(request.user)
-        Notification.objects.create(
-            recipient=article.journalist,
-            sender=request.user,
-            article=article,
-            notification_type='like',
-            message=f'{request.user.username} liked your article: {article.title}'
-        )
+    with transaction.atomic():
+        if toggle_reaction(article, request.user, 'likes', 'dislikes'):
+            notify(article.journalist, request.user, 'like', article,
+                   f'{request.user.username} liked your article: {article.title}')
+            retract(article.journalist, request.user, 'dislike', article)
+        else:
+            retract(article.journalist, request.user, 'like', article)
     return redirect('article_detail', pk=pk)
 
 
 @login_required
 def dislike_article(request, pk):
     article = get_object_or_404(Article, pk=pk)
-    if article.dislikes.filter(id=request.user.id).exists():
-        article.dislikes.remove(request.user)
-    else:
-        article.dislikes.add(request.user)
-        if article.likes.filter(id=request.user.id).exists():
-            article.likes.remove(request.user)
-        Notification.objects.create(
-            recipient=article.journalist,
-            sender=request.user,
-            article=article,
-            notification_type='dislike',
-            message=f'{request.user.username} disliked your article: {article.title}'
-        )
+    with transaction.atomic():
+        if toggle_reaction(article, request.user, 'dislikes', 'likes'):
+            notify(article.journalist, request.user, 'dislike', article,
+                   f'{request.user.username} disliked your article: {article.title}')
+            retract(article.journalist, request.user, 'like', article)
+        else:
+            retract(article.journalist, request.user, 'dislike', article)
     return redirect('article_detail', pk=pk)
 
 
@@ -115,13 +100,8 @@ def comment_newsletter(request, pk):
             comment.newsletter = newsletter
             comment.user = request.user
             comment.save()
-            Notification.objects.create(
-                recipient=newsletter.journalist,
-                sender=request.user,
-                newsletter=newsletter,
-                notification_type='comment',
-                message=f'{request.user.username} commented on your newsletter: {newsletter.title}'
-            )
+            notify(newsletter.journalist, request.user, 'comment', newsletter,
+                   f'{request.user.username} commented on your newsletter: {newsletter.title}')
             return redirect('newsletter_detail', pk=pk)
     else:
         form = CommentForm()
@@ -131,38 +111,26 @@ def comment_newsletter(request, pk):
 @login_required
 def like_newsletter(request, pk):
     newsletter = get_object_or_404(Newsletter, pk=pk)
-    if newsletter.likes.filter(id=request.user.id).exists():
-        newsletter.likes.remove(request.user)
-    else:
-        newsletter.likes.add(request.user)
-        if newsletter.dislikes.filter(id=request.user.id).exists():
-            newsletter.dislikes.remove(request.user)
-        Notification.objects.create(
-            recipient=newsletter.journalist,
-            sender=request.user,
-            newsletter=newsletter,
-            notification_type='like',
-            message=f'{request.user.username} liked your newsletter: {newsletter.title}'
-        )
+    with transaction.atomic():
+        if toggle_reaction(newsletter, request.user, 'likes', 'dislikes'):
+            notify(newsletter.journalist, request.user, 'like', newsletter,
+                   f'{request.user.username} liked your newsletter: {newsletter.title}')
+            retract(newsletter.journalist, request.user, 'dislike', newsletter)
+        else:
+            retract(newsletter.journalist, request.user, 'like', newsletter)
     return redirect('newsletter_detail', pk=pk)
 
 
 @login_required
 def dislike_newsletter(request, pk):
     newsletter = get_object_or_404(Newsletter, pk=pk)
-    if newsletter.dislikes.filter(id=request.user.id).exists():
-        newsletter.dislikes.remove(request.user)
-    else:
-        newsletter.dislikes.add(request.user)
-        if newsletter.likes.filter(id=request.user.id).exists():
-            newsletter.likes.remove(request.user)
-        Notification.objects.create(
-            recipient=newsletter.journalist,
-            sender=request.user,
-            newsletter=newsletter,
-            notification_type='dislike',
-            message=f'{request.user.username} disliked your newsletter: {newsletter.title}'
-        )
+    with transaction.atomic():
+        if toggle_reaction(newsletter, request.user, 'dislikes', 'likes'):
+            notify(newsletter.journalist, request.user, 'dislike', newsletter,
+                   f'{request.user.username} disliked your newsletter: {newsletter.title}')
+            retract(newsletter.journalist, request.user, 'like', newsletter)
+        else:
+            retract(newsletter.journalist, request.user, 'dislike', newsletter)
     return redirect('newsletter_detail', pk=pk)
 
 
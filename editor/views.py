@@ -3,12 +3,13 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect
 from article.models import Article
 from newsletter.models import Newsletter
+from accounts.roles import has_group
 from django.contrib import messages
 
 
 # Create your views here.
 def verify_editor(account):
-    return account.position == 'editor' or account.groups.filter(name='Editor').exists()
+    return account.position == 'editor' or has_group(account, 'Editor')
 
 
 @login_required
@@ -25,17 +26,17 @@ def dashboard_editor(request):
 
 @login_required
 def approve_article(request, pk):
-    article = get_object_or_404(Article, pk=pk)
+    article = get_object_or_404(Article.objects.only('id', 'title', 'approved'), pk=pk)
     article.approved = True
-    article.save()
+    article.save_dirty()
     messages.success(request, f'Article "{article.title}" has been approved.')
     return redirect('dashboard_editor')
 
 
 @login_required
 def approve_newsletter(request, pk):
-    newsletter = get_object_or_404(Newsletter, pk=pk)
+    newsletter = get_object_or_404(Newsletter.objects.only('id', 'title', 'approved'), pk=pk)
     newsletter.approved = True
-    newsletter.save()
+    newsletter.save_dirty()
     messages.success(request, f'Newsletter "{newsletter.title}" has been approved.')
     return redirect('dashboard_editor')
\ No newline at end of file
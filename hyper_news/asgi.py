@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hyper_news.settings')
 
 application = get_asgi_application()
+
+from hyper_news.template_backends import preload_templates  # noqa: E402
+
+preload_templates()
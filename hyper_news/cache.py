@@ -0,0 +1,159 @@
+"""
+Versioned read cache for models that change far less often than they are read.
+
+Each tracked model has a generation number in the cache, and every cached read
+that depends on the model carries that number in its key. Saving or deleting a
+row, or changing one of its many-to-many fields, bumps the generation once the
+transaction commits. That orphans all the model's cached reads at once,
+without scanning keys, on any backend that supports incr (locmem, file,
+database, memcached, redis). Orphaned entries simply expire.
+
+Reads and generations are stored in the MODEL_CACHE alias, by default a
+TwoTierCache (see hyper_news.cache_backends) in front of the default cache.
+"""
+import hashlib
+import math
+import random
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.connection import ConnectionProxy
+
+
+GENERATION_KEY = 'generation:{}'
+MAX_KEY_LENGTH = 200
+# Seconds a recompute may hold a key's lock, and how often waiting requests poll.
+LOCK_TIMEOUT = 30
+WAIT_INTERVAL = 0.05
+
+cache = ConnectionProxy(caches, getattr(settings, 'MODEL_CACHE', 'default'))
+
+
+def get_timeout():
+    return getattr(settings, 'MODEL_CACHE_TIMEOUT', 60 * 15)
+
+
+def _generation_key(model):
+    return GENERATION_KEY.format(model._meta.label_lower)
+
+
+def _initial_generation():
+    # Starts from the clock, so a generation evicted from the cache never comes
+    # back with a number that older entries were stored under.
+    return int(time.time() * 1000)
+
+
+def generations(*models):
+    """Return the current generation of each model, in one cache round trip."""
+    keys = [_generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial_generation(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump(model):
+    """Invalidate every cached read that depends on `model`."""
+    key = _generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_generation(), None)
+
+
+def invalidate(model):
+    """Bump the generation of `model` when the current transaction commits."""
+    transaction.on_commit(lambda: bump(model))
+
+
+def _join(name, stamp, parts):
+    key = ':'.join([name, stamp, *(str(part) for part in parts)])
+    if len(key) > MAX_KEY_LENGTH:
+        key = f'{name}:{stamp}:{hashlib.md5(key.encode()).hexdigest()}'
+    return key
+
+
+def cache_key(name, models, parts=()):
+    """Key of the read `name` with the given `parts`, stamped with the generations of `models`."""
+    return _join(name, '.'.join(str(number) for number in generations(*models)), parts)
+
+
+def _should_refresh(expires_at, delta, beta):
+    # Probabilistic early expiration: the closer the entry is to expiring and the
+    # longer it took to compute, the likelier one request refreshes it ahead of time.
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def cached(name, models, parts, producer, timeout=None, beta=1.0):
+    """
+    Return the value of `producer()` for the read `name` with `parts`, from the
+    cache while none of `models` changed and `timeout` has not passed.
+
+    Recomputing is single-flight: the request that takes the key's lock calls
+    `producer()`, while concurrent ones keep serving the previous value, i.e. the
+    entry being refreshed or the last one computed before the models changed.
+    Only when there is no previous value at all do they wait for the lock holder.
+    Entries are refreshed early with a probability that rises towards expiry
+    (scaled by `beta`), so hot keys are rarely found expired.
+    """
+    timeout = get_timeout() if timeout is None else timeout
+    key = cache_key(name, models, parts)
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires_at, delta = entry
+        if not _should_refresh(expires_at, delta, beta):
+            return value
+        return _recompute(key, name, parts, producer, timeout, stale=entry)
+    return _recompute(key, name, parts, producer, timeout, stale=cache.get(_join('stale', name, parts)))
+
+
+def _recompute(key, name, parts, producer, timeout, stale):
+    lock_key = f'lock:{key}'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        return _compute(key, lock_key, name, parts, producer, timeout)
+    if stale is not None:
+        return stale[0]
+    # Nothing to serve yet: wait for the lock holder, or take over if it gave up.
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if cache.add(lock_key, 1, LOCK_TIMEOUT):
+            return _compute(key, lock_key, name, parts, producer, timeout)
+    return producer()
+
+
+def _compute(key, lock_key, name, parts, producer, timeout):
+    try:
+        start = time.monotonic()
+        value = producer()
+        entry = (value, time.time() + timeout, time.monotonic() - start)
+        cache.set(key, entry, timeout)
+        # Outlives the entry, so the next generation can be served stale while it is computed.
+        cache.set(_join('stale', name, parts), entry, timeout * 2)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+def track(model):
+    """Bump the generation of `model` on every save, delete and many-to-many change."""
+    def changed(sender, **kwargs):
+        invalidate(model)
+
+    def relation_changed(sender, action, **kwargs):
+        if action.startswith('post_'):
+            invalidate(model)
+
+    uid = f'generation:{model._meta.label_lower}'
+    post_save.connect(changed, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(changed, sender=model, weak=False, dispatch_uid=uid)
+    for field in model._meta.many_to_many:
+        m2m_changed.connect(relation_changed, sender=field.remote_field.through, weak=False,
+                            dispatch_uid=f'{uid}:{field.name}')
@@ -0,0 +1,246 @@
+"""
+TwoTierCache: a bounded in-process LRU (L1) in front of another configured
+cache (L2, usually memcached or redis).
+
+Reads are answered from L1 for at most LOCAL_TIMEOUT seconds and then go back
+to L2. Writes go to both tiers, and incr/decr/delete drop the L1 copy. Other
+workers' L1 copies are not told about a write, so this backend is meant for
+keys that never change once written, such as the generation-stamped keys of
+hyper_news.cache. The generation numbers themselves stay in L1 for
+LOCAL_TIMEOUT at most, which bounds how long another worker can serve the
+previous generation.
+
+    CACHES = {
+        'default': {...},
+        'models': {
+            'BACKEND': 'hyper_news.cache_backends.TwoTierCache',
+            'LOCATION': 'default',  # the L2 cache alias
+            'OPTIONS': {'MAX_ENTRIES': 1000, 'LOCAL_TIMEOUT': 5},
+        },
+    }
+
+Keys are built once with this cache's KEY_PREFIX and VERSION and used as is
+in both tiers, so aliases with different prefixes can share one L2.
+
+Hits and misses are counted per tier and per KEY_PREFIX. The counts are added
+to L2 in batches, so tier_stats() and `manage.py model_cache_stats` see every
+worker's traffic.
+"""
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+STATS_KEY_PREFIX = 'two_tier_cache'
+STATS = ('local_hits', 'shared_hits', 'misses')
+STATS_FLUSH_EVERY = 100
+
+_missing = object()
+
+
+class LocalTier:
+    """Thread-safe LRU of pickled values with a per-entry expiry."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_missing):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, pickled = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout):
+        if timeout is not None and timeout <= 0:
+            self.delete(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, pickled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Django creates cache backends per thread; L1 is shared by the whole process.
+_local_tiers = {}
+_local_tiers_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = location or 'default'
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        with _local_tiers_lock:
+            key = (self.shared_alias, self.key_prefix)
+            if key not in _local_tiers:
+                _local_tiers[key] = (LocalTier(self._max_entries), Counter(), threading.Lock())
+            self.local, self._pending, self._stats_lock = _local_tiers[key]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _local_timeout(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        return self.local_timeout if timeout is None else min(timeout, self.local_timeout)
+
+    def _key(self, key, version=None):
+        # Both tiers store the key built with this cache's KEY_PREFIX, VERSION and
+        # KEY_FUNCTION; the shared cache then applies its own settings on top.
+        return self.make_and_validate_key(key, version)
+
+    def _stats_key(self, name):
+        return self._key(f'{STATS_KEY_PREFIX}:{name}')
+
+    def _record(self, **counts):
+        with self._stats_lock:
+            self._pending.update(counts)
+            if sum(self._pending.values()) < STATS_FLUSH_EVERY:
+                return
+            pending = dict(self._pending)
+            self._pending.clear()
+        self._flush_stats(pending)
+
+    def _flush_stats(self, pending):
+        for name, count in pending.items():
+            if not count:
+                continue
+            key = self._stats_key(name)
+            if not self.shared.add(key, count, timeout=None):
+                try:
+                    self.shared.incr(key, count)
+                except ValueError:
+                    self.shared.set(key, count, timeout=None)
+
+    def get(self, key, default=None, version=None):
+        key = self._key(key, version)
+        value = self.local.get(key)
+        if value is not _missing:
+            self._record(local_hits=1)
+            return value
+        value = self.shared.get(key, _missing)
+        if value is _missing:
+            self._record(misses=1)
+            return default
+        self._record(shared_hits=1)
+        self.local.set(key, value, self.local_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        full_keys = {self._key(key, version): key for key in keys}
+        found = {}
+        for full_key in full_keys:
+            value = self.local.get(full_key)
+            if value is not _missing:
+                found[full_key] = value
+        local_hits = len(found)
+        missing = [full_key for full_key in full_keys if full_key not in found]
+        if missing:
+            shared = self.shared.get_many(missing)
+            for full_key, value in shared.items():
+                self.local.set(full_key, value, self.local_timeout)
+            found.update(shared)
+        self._record(local_hits=local_hits, shared_hits=len(found) - local_hits,
+                     misses=len(full_keys) - len(found))
+        return {full_keys[full_key]: value for full_key, value in found.items()}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        self.shared.set(key, value, timeout)
+        self.local.set(key, value, self._local_timeout(timeout))
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        full_keys = {self._key(key, version): key for key in data}
+        failed = set(self.shared.set_many({full_key: data[key] for full_key, key in full_keys.items()}, timeout))
+        for full_key, key in full_keys.items():
+            if full_key not in failed:
+                self.local.set(full_key, data[key], self._local_timeout(timeout))
+        return [key for full_key, key in full_keys.items() if full_key in failed]
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        added = self.shared.add(key, value, timeout)
+        if added:
+            self.local.set(key, value, self._local_timeout(timeout))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(self._key(key, version), timeout)
+
+    def delete(self, key, version=None):
+        key = self._key(key, version)
+        self.local.delete(key)
+        return self.shared.delete(key)
+
+    def delete_many(self, keys, version=None):
+        full_keys = [self._key(key, version) for key in keys]
+        for full_key in full_keys:
+            self.local.delete(full_key)
+        self.shared.delete_many(full_keys)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _missing, version=version) is not _missing
+
+    def incr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        self.local.delete(key)
+        return self.shared.incr(key, delta)
+
+    def decr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        self.local.delete(key)
+        return self.shared.decr(key, delta)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    def tier_stats(self):
+        """Hit counters and ratios of both tiers, summed over every worker."""
+        with self._stats_lock:
+            pending = dict(self._pending)
+            self._pending.clear()
+        self._flush_stats(pending)
+        counters = self.shared.get_many([self._stats_key(name) for name in STATS])
+        stats = {name: counters.get(self._stats_key(name), 0) for name in STATS}
+        lookups = sum(stats.values())
+        shared_lookups = lookups - stats['local_hits']
+        stats['local_hit_ratio'] = stats['local_hits'] / lookups if lookups else 0.0
+        stats['shared_hit_ratio'] = stats['shared_hits'] / shared_lookups if shared_lookups else 0.0
+        stats['hit_ratio'] = (stats['local_hits'] + stats['shared_hits']) / lookups if lookups else 0.0
+        stats['local_entries'] = len(self.local)
+        return stats
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._pending.clear()
+        self.shared.delete_many([self._stats_key(name) for name in STATS])
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+
+def native_datetimes(context):
+    """Whether the renderer chosen for the request encodes datetime objects itself."""
+    request = context.get('request')
+    return getattr(getattr(request, 'accepted_renderer', None), 'native_datetimes', False)
+
+
+class NativeDateTimeField(serializers.DateTimeField):
+    """
+    DateTimeField that keeps the value a datetime (in the current time zone)
+    when the response renderer packs datetimes natively, e.g. MessagePack,
+    and formats it as usual for JSON and XML.
+    """
+
+    def to_representation(self, value):
+        if value and native_datetimes(self.context):
+            return self.enforce_timezone(value)
+        return super().to_representation(value)
@@ -0,0 +1,68 @@
+import json
+import time
+from datetime import timedelta
+import msgpack
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.fields import DateTimeField
+from rest_framework.renderers import JSONRenderer
+from rest_framework_xml.renderers import XMLRenderer
+from hyper_news.renderers import FastJSONRenderer, MessagePackRenderer, orjson
+
+
+class Command(BaseCommand):
+    help = ('Compare the throughput and output size of the API renderers on an '
+            'article list payload, and how fast a client decodes each format. '
+            'Does not touch the database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000,
+                            help='Articles in the rendered list.')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per renderer; the fastest is reported.')
+
+    def payload(self, rows, native_datetimes=False):
+        created_at = DateTimeField()
+        now = timezone.now()
+        return [{
+            'id': i,
+            'title': f'Article {i}: council approves the new city plan',
+            'content': 'The report said residents welcomed the plan. ' * 20,
+            'publisher': i % 50,
+            'journalist': i % 50,
+            'editors': [i % 7, i % 11],
+            'created_at': (now - timedelta(minutes=i) if native_datetimes
+                           else created_at.to_representation(now - timedelta(minutes=i))),
+        } for i in range(rows)]
+
+    def best_of(self, repeat, func, *args):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(*args)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        data = self.payload(rows)
+        json_loads = orjson.loads if orjson is not None else json.loads
+        formats = [
+            # name, renderer, payload, client-side decoder
+            ('XMLRenderer', XMLRenderer(), data, None),
+            ('JSONRenderer', JSONRenderer(), data, json.loads),
+            ('FastJSONRenderer', FastJSONRenderer(), data, json_loads),
+            ('MessagePack', MessagePackRenderer(), self.payload(rows, native_datetimes=True),
+             lambda body: msgpack.unpackb(body, timestamp=3)),
+        ]
+        self.stdout.write(f'Articles:  {rows}')
+        self.stdout.write(f'orjson:    {"installed" if orjson is not None else "not installed, FastJSONRenderer falls back"}')
+        self.stdout.write(f'{"":<17} {"render rows/s":>14} {"decode rows/s":>14} {"size KiB":>9}')
+        bodies = {}
+        for name, renderer, payload, decode in formats:
+            body, render_time = self.best_of(repeat, renderer.render, payload, renderer.media_type, {})
+            bodies[name] = body
+            decoded = f'{rows / self.best_of(repeat, decode, body)[1]:>14,.0f}' if decode else f'{"-":>14}'
+            self.stdout.write(f'{name:<17} {rows / render_time:>14,.0f} {decoded} {len(body) / 1024:>9,.0f}')
+        self.stdout.write(f'Identical JSON:    {bodies["JSONRenderer"] == bodies["FastJSONRenderer"]}')
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Show the per-tier hit ratios of the two-tier model cache (MODEL_CACHE), '
+            'or of another TwoTierCache alias.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Reset the counters after printing them.')
+        parser.add_argument('--cache', default=getattr(settings, 'MODEL_CACHE', 'default'),
+                            help='Cache alias to report on (default: MODEL_CACHE).')
+
+    def handle(self, *args, **options):
+        if options['cache'] not in settings.CACHES:
+            raise CommandError(f"Unknown cache alias '{options['cache']}'.")
+        model_cache = caches[options['cache']]
+        if not hasattr(model_cache, 'tier_stats'):
+            raise CommandError(f"'{options['cache']}' is not a hyper_news.cache_backends.TwoTierCache.")
+        stats = model_cache.tier_stats()
+        self.stdout.write(f"L1 (process) hits:  {stats['local_hits']}")
+        self.stdout.write(f"L2 (shared) hits:   {stats['shared_hits']}")
+        self.stdout.write(f"Misses:             {stats['misses']}")
+        self.stdout.write(f"L1 hit ratio:       {stats['local_hit_ratio']:.1%}")
+        self.stdout.write(f"L2 hit ratio:       {stats['shared_hit_ratio']:.1%} of L1 misses")
+        self.stdout.write(f"Overall hit ratio:  {stats['hit_ratio']:.1%}")
+        if options['reset']:
+            model_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -0,0 +1,41 @@
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.template import engines
+from hyper_news.template_backends import DjangoTemplates, render_stats, reset_render_stats
+
+
+class Command(BaseCommand):
+    help = ('Show the render count and time of each template, summed over every '
+            'worker, and the total per app. Times include extended and included templates.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20,
+                            help='Templates to list, by total render time.')
+        parser.add_argument('--reset', action='store_true',
+                            help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        sources = {}
+        for engine in engines.all():
+            if isinstance(engine, DjangoTemplates):
+                for name, found in engine.template_sources().items():
+                    sources.setdefault(name, found[0][0] or 'project')
+        stats = render_stats(sources)
+        if not stats:
+            self.stdout.write('No renders recorded.')
+        by_total = sorted(stats.items(), key=lambda item: -item[1][1])
+        if stats:
+            self.stdout.write(f"{'renders':>8} {'total ms':>10} {'mean ms':>8}  template")
+        for name, (count, seconds) in by_total[:options['limit']]:
+            self.stdout.write(f'{count:8d} {seconds * 1000:10.1f} {seconds * 1000 / count:8.2f}  {name}')
+        per_app = defaultdict(lambda: [0, 0.0])
+        for name, (count, seconds) in stats.items():
+            per_app[sources[name]][0] += count
+            per_app[sources[name]][1] += seconds
+        grand_total = sum(seconds for _, seconds in per_app.values())
+        for app, (count, seconds) in sorted(per_app.items(), key=lambda item: -item[1][1]):
+            self.stdout.write(f'{app:>14}: {count} renders, {seconds * 1000:.1f} ms '
+                              f'({seconds / grand_total:.1%})')
+        if options['reset']:
+            reset_render_stats(sources)
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
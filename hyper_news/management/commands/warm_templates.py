@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from hyper_news.template_backends import DjangoTemplates
+
+
+class Command(BaseCommand):
+    help = ('Parse every template into the cached loader, as the servers do at startup '
+            'with TEMPLATE_PRELOAD, and report parse errors, the slowest templates '
+            'and templates shadowed by another app.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10,
+                            help='Slowest templates to list.')
+
+    def handle(self, *args, **options):
+        failed = 0
+        for engine in engines.all():
+            if not isinstance(engine, DjangoTemplates):
+                continue
+            results = engine.parse_all()
+            errors = {name: result for name, result in results.items() if isinstance(result, Exception)}
+            timings = {name: result for name, result in results.items() if name not in errors}
+            self.stdout.write(f'{engine.name}: parsed {len(timings)} templates '
+                              f'in {sum(timings.values()) * 1000:.1f} ms.')
+            for name, seconds in sorted(timings.items(), key=lambda item: -item[1])[:options['limit']]:
+                self.stdout.write(f'  {seconds * 1000:8.2f} ms  {name}')
+            for name, sources in engine.template_sources().items():
+                if len(sources) > 1:
+                    used, *shadowed = (label or path for label, path in sources)
+                    self.stdout.write(self.style.WARNING(
+                        f"  {name} from {used} shadows the copies in {', '.join(shadowed)}"))
+            for name, exc in errors.items():
+                self.stderr.write(self.style.ERROR(f'  {name}: {exc}'))
+            failed += len(errors)
+        if failed:
+            raise CommandError(f'{failed} template(s) failed to parse.')
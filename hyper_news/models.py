@@ -0,0 +1,68 @@
+class DirtyFieldsMixin:
+    """
+    Model mixin that remembers the column values loaded from the database, so
+    signals and views can tell which fields changed since the row was read.
+
+    `dirty_dependencies` maps a field to fields that pre_save handlers derive
+    from it (e.g. content -> sentiment); they are written together by save_dirty().
+    """
+    dirty_dependencies = {}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_values()
+        return instance
+
+    def _remember_values(self, field_names=None):
+        """Record the current value of the loaded fields (or of `field_names`) as saved."""
+        loaded = self.__dict__.setdefault('_loaded_values', {})
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__ and (field_names is None or field.name in field_names
+                                                   or field.attname in field_names):
+                loaded[field.attname] = getattr(self, field.attname)
+
+    def get_dirty_fields(self):
+        """
+        Return the names of the concrete fields changed since the instance was loaded
+        or saved. Unsaved instances report every field.
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        fields = self._meta.concrete_fields
+        if self._state.adding or loaded is None:
+            return [field.name for field in fields]
+        return [field.name for field in fields
+                if field.attname in self.__dict__
+                and (field.attname not in loaded or getattr(self, field.attname) != loaded[field.attname])]
+
+    def is_dirty(self, field_name):
+        return field_name in self.get_dirty_fields()
+
+    def saved_value(self, field_name):
+        """Return the value `field_name` had when the instance was loaded or last saved."""
+        attname = self._meta.get_field(field_name).attname
+        return getattr(self, '_loaded_values', {}).get(attname, getattr(self, attname))
+
+    def save_dirty(self, **kwargs):
+        """Write only the changed columns with a single UPDATE. Returns the fields saved."""
+        fields = self.get_dirty_fields()
+        if self._state.adding:
+            self.save(**kwargs)
+            return fields
+        for name in list(fields):
+            fields.extend(dep for dep in self.dirty_dependencies.get(name, ()) if dep not in fields)
+        if fields:
+            # auto_now fields are only written when they are in update_fields.
+            fields.extend(field.name for field in self._meta.concrete_fields
+                          if getattr(field, 'auto_now', False) and field.name not in fields)
+        if fields:
+            self.save(update_fields=fields, **kwargs)
+        return fields
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._remember_values(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_values(kwargs.get('fields'))
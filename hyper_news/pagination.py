@@ -0,0 +1,109 @@
+import base64
+import binascii
+from datetime import datetime
+from django.db.models import Q
+from .cache import cached
+
+
+DEFAULT_PAGE_SIZE = 12
+
+
+def encode_cursor(created_at, pk):
+    """Encode the (created_at, id) position of a row as an opaque url-safe token."""
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a token produced by encode_cursor.
+    Returns a (created_at, id) tuple, or None when the token is missing or malformed.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class KeysetPage:
+    """A single page of a keyset paginated queryset."""
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def cached_page(name, models, queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    keyset_paginate() through the versioned model cache (see hyper_news.cache):
+    the page is reused until one of `models` changes.
+    """
+    # Malformed cursors all mean the first page, so they share its entry.
+    cursor = cursor if decode_cursor(cursor) else None
+    return cached(name, models, [cursor, page_size], lambda: keyset_paginate(queryset, cursor, page_size))
+
+
+def keyset_paginate(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE, id_field='id'):
+    """
+    Return the page of `queryset` that follows `cursor`, newest first.
+    Rows are ordered by (created_at, id) descending so the lookup is a range scan
+    on the matching (created_at, id) index, whatever the size of the table.
+    `id_field` names the tie-breaking column when it is not the primary key.
+    """
+    queryset = queryset.order_by('-created_at', f'-{id_field}')
+    position = decode_cursor(cursor)
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, **{f'{id_field}__lt': pk})
+        )
+
+    # Fetch one extra row to find out whether there is a next page.
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, getattr(last, id_field))
+    return KeysetPage(rows, next_cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that replaces offset pagination with keyset pagination.
+    The current page is read from the `cursor` query parameter and the token of the
+    following page is exposed to templates as `next_cursor`. Pages are cached
+    until one of `cache_models` changes, when it is set.
+    """
+    page_size = DEFAULT_PAGE_SIZE
+    cursor_kwarg = 'cursor'
+    cache_models = ()
+
+    def get_page(self):
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if self.cache_models:
+            return cached_page(f'{self.model._meta.label_lower}:page', self.cache_models,
+                               self.object_list, cursor, self.page_size)
+        return keyset_paginate(self.object_list, cursor, self.page_size)
+
+    def get_context_data(self, **kwargs):
+        page = self.get_page()
+        kwargs['object_list'] = page.object_list
+        context = super().get_context_data(**kwargs)
+        context['page'] = page
+        context['next_cursor'] = page.next_cursor
+        return context
@@ -0,0 +1,60 @@
+"""
+Renderers for the DRF API.
+
+FastJSONRenderer encodes with orjson when it is installed and falls back to
+DRF's JSONRenderer otherwise. The output matches JSONRenderer's compact,
+unicode output; values orjson does not handle natively (lazy strings,
+datetimes, decimals, querysets...) go through DRF's encoder.
+
+MessagePackRenderer is the binary format of the content APIs, see
+hyper_news.parsers for the matching parser.
+"""
+import msgpack
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that skips the stdlib encoder when orjson is available."""
+
+    if orjson is not None:
+        # Datetimes go through DRF's encoder, which writes UTC as 'Z' rather than '+00:00'.
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        fallback = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            # orjson only indents by two spaces; let the stdlib honour the requested indent.
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=self.fallback, option=self.options)
+        # Like JSONRenderer, escape the separators that are invalid in JavaScript strings.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders `application/msgpack`. Serializer fields that check native_datetimes
+    (see hyper_news.fields) hand it datetime objects, which are packed as
+    MessagePack timestamps instead of ISO 8601 strings; integers and id lists
+    use MessagePack's variable-width encoding.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    native_datetimes = True
+    fallback = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.fallback, datetime=True, use_bin_type=True)
@@ -0,0 +1,78 @@
+"""
+Sparse fieldsets and expansion for the content APIs.
+
+`?fields=id,title` limits a response to the listed fields and `?expand=journalist`
+inlines a related object instead of its id. Both only apply to GET requests.
+The serializer's prepare_queryset() narrows the SQL to match, so the columns
+loaded and the number of queries follow what the client asked for.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+
+def split_param(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value else []
+
+
+def requested_fields(context):
+    """
+    Return (fields, expand) for the request in `context`: the requested field names,
+    or None for all of them, and the set of relations to expand.
+    """
+    request = context.get('request')
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None, set()
+    params = request.query_params
+    fields = set(split_param(params.get('fields'))) or None
+    return fields, set(split_param(params.get('expand')))
+
+
+class ExpandableFieldsMixin:
+    """
+    ModelSerializer mixin for `?fields=` and `?expand=`. `expandable_fields` maps a
+    foreign key or many-to-many field to the serializer that inlines it.
+    """
+    expandable_fields = {}
+
+    @classmethod
+    def selected(cls, context):
+        """Return (field names in output order, relations to expand)."""
+        fields, expand = requested_fields(context)
+        names = [name for name in cls.Meta.fields if fields is None or name in fields]
+        return names, expand & cls.expandable_fields.keys() & set(names)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        names, expand = self.selected(self.context)
+        fields = {name: fields[name] for name in names}
+        for name in expand:
+            many = self.Meta.model._meta.get_field(name).many_to_many
+            fields[name] = self.expandable_fields[name](many=many, read_only=True)
+        return fields
+
+    @classmethod
+    def prepare_queryset(cls, queryset, context):
+        """
+        Load only the requested columns, join the expanded foreign keys, and
+        prefetch many-to-many fields (just their ids unless they are expanded).
+        """
+        names, expand = cls.selected(context)
+        opts = cls.Meta.model._meta
+        only = ['pk']
+        for name in names:
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            nested = cls.expandable_fields[name].Meta.fields if name in expand else None
+            if field.many_to_many:
+                related = field.related_model.objects.only(*(nested or ['pk']))
+                queryset = queryset.prefetch_related(Prefetch(name, queryset=related))
+                continue
+            only.append(name)
+            if nested:
+                queryset = queryset.select_related(name)
+                only.extend(f'{name}__{nested_name}' for nested_name in nested)
+        if names != list(cls.Meta.fields):
+            queryset = queryset.only(*only)
+        return queryset
@@ -27,7 +27,7 @@ environ.Env.read_env(os.path.join(BASE_DIR, '.env'))
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = env('SECRET_KEY')
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env.bool('DEBUG', default=True)
 
 ALLOWED_HOSTS = []
 
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
     'newsletter',
     'comment',
     'notification',
+    'sentiment',
 ]
 
 MIDDLEWARE = [
@@ -62,23 +63,37 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.roles.RoleCacheMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'hyper_news.urls'
 
+# Production template mode: every template is parsed once, when the WSGI/ASGI
+# app starts (`manage.py warm_templates` checks the same ahead of a deploy).
+# Render times are recorded either way, see `manage.py template_stats`.
+TEMPLATE_PRELOAD = env.bool('TEMPLATE_PRELOAD', default=not DEBUG)
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'hyper_news.template_backends.DjangoTemplates',
+        'NAME': 'django',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+            'preload': TEMPLATE_PRELOAD,
+            'timing': env.bool('TEMPLATE_TIMING', default=True),
         },
     },
 ]
@@ -100,6 +115,31 @@ DATABASES = {
     }
 }
 
+# Cache used by the versioned model cache (hyper_news.cache), sessions' role
+# cache, sentiment results and counters. Set CACHE_URL in .env, e.g.
+# pymemcache://127.0.0.1:11211 or filecache:///var/tmp/hyper_news;
+# the default keeps a per-process in-memory cache.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+    # Article/newsletter/comment reads: a per-process LRU in front of 'default'.
+    # Other workers may serve a changed model's previous version for up to
+    # LOCAL_TIMEOUT seconds; `manage.py model_cache_stats` shows the hit ratios.
+    'models': {
+        'BACKEND': 'hyper_news.cache_backends.TwoTierCache',
+        'LOCATION': 'default',
+        'OPTIONS': {'MAX_ENTRIES': 1000, 'LOCAL_TIMEOUT': 5},
+    },
+    # {% cache %} fragments of the article/newsletter cards. Their keys include
+    # the row's updated_at, so L1 copies can be kept longer than model reads.
+    'template_fragments': {
+        'BACKEND': 'hyper_news.cache_backends.TwoTierCache',
+        'LOCATION': 'default',
+        'KEY_PREFIX': 'fragments',
+        'OPTIONS': {'MAX_ENTRIES': 2000, 'LOCAL_TIMEOUT': 300},
+    },
+}
+MODEL_CACHE = 'models'
+
 # Docker password configuration:
 # 'PASSWORD': 'your_password_here',
 # 'HOST': 'host.docker.internal',
@@ -124,13 +164,36 @@ AUTH_PASSWORD_VALIDATORS = [
 
 
 REST_FRAMEWORK = {
+    # JSON unless the client asks for XML (Accept: application/xml or ?format=xml).
     'DEFAULT_RENDERER_CLASSES': (
+        'hyper_news.renderers.FastJSONRenderer',
         'rest_framework_xml.renderers.XMLRenderer',
-        'rest_framework.renderers.JSONRenderer',
     )
 }
 
 
+# Sentiment analysis backend used by the sentiment app. The built-in
+# 'sentiment.backends.LexiconBackend' scores batches with NumPy and is much faster.
+# Cached polarities are keyed by content only, so run `manage.py rescore_sentiment`
+# after switching backends.
+SENTIMENT_BACKEND = 'sentiment.backends.TextBlobBackend'
+
+# Likes/dislikes of the same article or newsletter within this many seconds are
+# folded into one unread "N people liked ..." notification.
+NOTIFICATION_COALESCE_WINDOW = 60 * 60
+
+# Reader timelines keep the newest TIMELINE_MAX_ENTRIES articles per reader.
+# Articles by journalists/publishers with more than TIMELINE_FANOUT_LIMIT
+# subscribers are merged in when the feed is read instead of being copied.
+# A source that drops back under the limit has its readers' timelines rebuilt
+# when the cached list of such sources is next refreshed (every 10 minutes).
+TIMELINE_MAX_ENTRIES = 500
+TIMELINE_FANOUT_LIMIT = 5000
+
+# Seconds a cached Article/Newsletter/Comment read is kept. Entries are
+# invalidated on change by generation numbers, so this only bounds memory.
+MODEL_CACHE_TIMEOUT = 60 * 15
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -0,0 +1,159 @@
+"""
+DjangoTemplates backend that can pre-parse every template and times renders.
+
+    TEMPLATES = [{
+        'BACKEND': 'hyper_news.template_backends.DjangoTemplates',
+        'OPTIONS': {
+            'loaders': [('django.template.loaders.cached.Loader', [...])],
+            'preload': True,   # parse everything when the WSGI/ASGI app starts
+            'timing': True,    # record the render time of each template
+        },
+    }]
+
+With the cached loader a template is read and parsed once per process, on its
+first use. preload_templates() moves that work to startup, so the first
+requests of a new worker do not pay for it, and a template that fails to parse
+stops the deploy instead of one page. `manage.py warm_templates` does the same
+from the command line and reports parse times and shadowed templates.
+
+Render times are kept per template name: the template a view renders,
+including the templates it extends and includes. They are added to the default
+cache in batches, so `manage.py template_stats` sees every worker's renders.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from django.apps import apps
+from django.core.cache import cache
+from django.template import engines
+from django.template.backends.django import DjangoTemplates as BaseDjangoTemplates
+
+
+STATS_KEY_PREFIX = 'template_render'
+STATS_FLUSH_EVERY = 100
+
+_pending = defaultdict(lambda: [0, 0])
+_pending_lock = threading.Lock()
+
+
+def _stats_keys(name):
+    return f'{STATS_KEY_PREFIX}:{name}:count', f'{STATS_KEY_PREFIX}:{name}:us'
+
+
+def record_render(name, seconds):
+    with _pending_lock:
+        counts = _pending[name]
+        counts[0] += 1
+        counts[1] += int(seconds * 1_000_000)
+        if sum(count for count, _ in _pending.values()) < STATS_FLUSH_EVERY:
+            return
+        pending = dict(_pending)
+        _pending.clear()
+    _flush_stats(pending)
+
+
+def _flush_stats(pending):
+    for name, counts in pending.items():
+        for key, value in zip(_stats_keys(name), counts):
+            if not cache.add(key, value, timeout=None):
+                try:
+                    cache.incr(key, value)
+                except ValueError:
+                    cache.set(key, value, timeout=None)
+
+
+def render_stats(names):
+    """Return {name: (renders, total seconds)} for the templates in `names` that were rendered."""
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+    _flush_stats(pending)
+    keys = {name: _stats_keys(name) for name in names}
+    found = cache.get_many([key for pair in keys.values() for key in pair])
+    return {name: (found[count_key], found.get(us_key, 0) / 1_000_000)
+            for name, (count_key, us_key) in keys.items() if found.get(count_key)}
+
+
+def reset_render_stats(names):
+    with _pending_lock:
+        _pending.clear()
+    cache.delete_many([key for name in names for key in _stats_keys(name)])
+
+
+class TimedTemplate:
+    """Wraps a backend template to record how long each render takes."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            record_render(self.template.origin.template_name, time.perf_counter() - start)
+
+
+class DjangoTemplates(BaseDjangoTemplates):
+
+    def __init__(self, params):
+        params = params.copy()
+        options = params.pop('OPTIONS').copy()
+        self.preload = options.pop('preload', False)
+        self.timing = options.pop('timing', False)
+        params['OPTIONS'] = options
+        super().__init__(params)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template) if self.timing else template
+
+    def template_sources(self):
+        """
+        Return {template name: [(app label or None, path), ...]} for every file the
+        engine's loaders can find, in lookup order; only the first source is used.
+        """
+        app_labels = {os.path.join(config.path, 'templates'): config.label
+                      for config in apps.get_app_configs()}
+        sources = defaultdict(list)
+        for loader in self.engine.template_loaders:
+            for inner in getattr(loader, 'loaders', [loader]):
+                for directory in inner.get_dirs():
+                    directory = str(directory)
+                    for root, dirs, files in os.walk(directory):
+                        dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+                        for filename in sorted(files):
+                            if filename.startswith('.'):
+                                continue
+                            path = os.path.join(root, filename)
+                            name = os.path.relpath(path, directory).replace(os.sep, '/')
+                            sources[name].append((app_labels.get(directory), path))
+        return dict(sources)
+
+    def parse_all(self):
+        """Parse every template into the loader's cache. Returns {name: seconds or exception}."""
+        results = {}
+        for name in self.template_sources():
+            start = time.perf_counter()
+            try:
+                self.engine.get_template(name)
+            except Exception as exc:
+                results[name] = exc
+            else:
+                results[name] = time.perf_counter() - start
+        return results
+
+
+def preload_templates():
+    """Parse every template of the engines configured with `preload`; called at server startup."""
+    for engine in engines.all():
+        if getattr(engine, 'preload', False):
+            failed = {name: exc for name, exc in engine.parse_all().items()
+                      if isinstance(exc, Exception)}
+            if failed:
+                name, exc = next(iter(failed.items()))
+                raise RuntimeError(f'{len(failed)} template(s) failed to parse, first {name}: {exc}') from exc
@@ -0,0 +1,109 @@
+from unittest import mock
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from . import cache as model_cache
+from .cache_backends import TwoTierCache
+
+
+class TwoTierCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.first = self.make_cache('first')
+        self.second = self.make_cache('second')
+
+    def make_cache(self, prefix):
+        cache = TwoTierCache('default', {'KEY_PREFIX': prefix, 'OPTIONS': {'MAX_ENTRIES': 10}})
+        cache.local.clear()
+        return cache
+
+    def test_prefixes_do_not_collide_in_the_shared_tier(self):
+        self.first.set('key', 'first')
+        self.second.set('key', 'second')
+        self.first.local.clear()
+        self.second.local.clear()
+        self.assertEqual(self.first.get('key'), 'first')
+        self.assertEqual(self.second.get('key'), 'second')
+        self.assertEqual(self.first.get_many(['key', 'missing']), {'key': 'first'})
+
+    def test_versions_match_across_tiers(self):
+        self.first.set('key', 'v2', version=2)
+        self.assertIsNone(self.first.get('key'))
+        self.assertEqual(self.first.get('key', version=2), 'v2')
+        self.first.local.clear()
+        self.assertIsNone(self.first.get('key'))
+        self.assertEqual(self.first.get('key', version=2), 'v2')
+        self.first.set('count', 1, version=2)
+        self.assertEqual(self.first.incr('count', version=2), 2)
+        self.first.delete('key', version=2)
+        self.assertIsNone(self.first.get('key', version=2))
+
+    def test_set_many_and_delete_many(self):
+        self.assertEqual(self.first.set_many({'a': 1, 'b': 2}), [])
+        self.first.local.clear()
+        self.assertEqual(self.first.get_many(['a', 'b']), {'a': 1, 'b': 2})
+        self.assertEqual(self.second.get_many(['a', 'b']), {})
+        self.first.delete_many(['a', 'b'])
+        self.assertEqual(self.first.get_many(['a', 'b']), {})
+
+
+class CachedTests(SimpleTestCase):
+    def setUp(self):
+        model_cache.cache.clear()
+
+    def cached(self, producer):
+        # beta=0 turns off early refreshes, so only expiry and generations matter.
+        return model_cache.cached('read', [Group], ['a'], producer, beta=0)
+
+    def lock_key(self):
+        return f'lock:{model_cache.cache_key("read", [Group], ["a"])}'
+
+    def test_concurrent_caller_is_served_the_stale_value(self):
+        self.cached(lambda: 'old')
+        model_cache.bump(Group)
+        concurrent = []
+
+        def producer():
+            # Runs while this request holds the lock.
+            concurrent.append(self.cached(self.fail))
+            return 'new'
+
+        self.assertEqual(self.cached(producer), 'new')
+        self.assertEqual(concurrent, ['old'])
+        self.assertEqual(self.cached(self.fail), 'new')
+
+    def test_caller_without_stale_value_waits_for_the_lock_holder(self):
+        model_cache.cache.add(self.lock_key(), 1, model_cache.LOCK_TIMEOUT)
+
+        def holder_finishes(seconds):
+            model_cache._compute(model_cache.cache_key('read', [Group], ['a']), self.lock_key(),
+                                 'read', ['a'], lambda: 'computed', 60)
+
+        with mock.patch.object(model_cache.time, 'sleep', side_effect=holder_finishes) as sleep:
+            self.assertEqual(self.cached(self.fail), 'computed')
+        sleep.assert_called_once_with(model_cache.WAIT_INTERVAL)
+
+    def test_waiting_caller_takes_over_when_the_lock_is_released(self):
+        model_cache.cache.add(self.lock_key(), 1, model_cache.LOCK_TIMEOUT)
+
+        def holder_gives_up(seconds):
+            model_cache.cache.delete(self.lock_key())
+
+        with mock.patch.object(model_cache.time, 'sleep', side_effect=holder_gives_up):
+            self.assertEqual(self.cached(lambda: 'mine'), 'mine')
+        self.assertIsNone(model_cache.cache.get(self.lock_key()))
+
+    def test_lock_is_released_when_the_producer_raises(self):
+        def producer():
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            self.cached(producer)
+        self.assertIsNone(model_cache.cache.get(self.lock_key()))
+        self.assertEqual(self.cached(lambda: 'value'), 'value')
+
+    def test_generation_bump_forces_a_recompute(self):
+        self.assertEqual(self.cached(lambda: 1), 1)
+        self.assertEqual(self.cached(self.fail), 1)
+        model_cache.bump(Group)
+        self.assertEqual(self.cached(lambda: 2), 2)
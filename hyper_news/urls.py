@@ -29,6 +29,7 @@ urlpatterns = [
     path('', include('reader.urls')),
     path('', include('journalist.urls')),
     path('', include('comment.urls')),
+    path('', include('notification.urls')),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
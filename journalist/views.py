@@ -3,6 +3,8 @@ from article.models import Article
 from newsletter.models import Newsletter
 from accounts.models import CustomUser
 from notification.models import Notification
+from notification.inbox import unread_count
+from hyper_news.pagination import keyset_paginate
 
 
 # Create your views here.
@@ -16,6 +18,11 @@ def journalist_dashboard(request):
     dash_list = {
         'articles': Article.objects.filter(journalist=journalist_option),
         'newsletters': Newsletter.objects.filter(journalist=journalist_option),
-        'notifications': Notification.objects.filter(recipient=journalist_option)
+        # Latest page only; older notifications are read through the inbox API.
+        'notifications': keyset_paginate(
+            Notification.objects.filter(recipient=journalist_option).select_related('sender'),
+            page_size=10,
+        ),
+        'unread_count': unread_count(journalist_option),
     }
     return render(request, 'journalist/journalist_dashboard.html', {'dash_list': dash_list})
\ No newline at end of file
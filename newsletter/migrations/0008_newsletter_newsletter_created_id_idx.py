@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0007_newsletter_dislikes_newsletter_likes_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['created_at', 'id'], name='newsletter_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0008_newsletter_newsletter_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsletter',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0009_newsletter_dislikes_count_newsletter_likes_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['sentiment'], name='newsletter_sentiment_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0010_newsletter_newsletter_sentiment_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newsletter',
+            name='journalist',
+            field=models.ForeignKey(limit_choices_to={'position': 'journalist'}, on_delete=django.db.models.deletion.CASCADE, related_name='newsletters_jour', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='newsletter',
+            name='publisher',
+            field=models.ManyToManyField(limit_choices_to={'position': 'publisher'}, related_name='newsletters_pub', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
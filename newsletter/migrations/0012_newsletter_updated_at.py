@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0011_alter_newsletter_journalist_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsletter',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_reaction_counts(apps, schema_editor):
+    """Fill likes_count/dislikes_count from the through tables, one UPDATE per counter."""
+    Newsletter = apps.get_model('newsletter', 'Newsletter')
+    for name in ('likes', 'dislikes'):
+        field = Newsletter._meta.get_field(name)
+        owner = f'{field.m2m_field_name()}_id'
+        counts = (field.remote_field.through.objects
+                  .filter(**{owner: OuterRef('pk')})
+                  .order_by()
+                  .values(owner)
+                  .annotate(count=Count('pk'))
+                  .values('count'))
+        Newsletter.objects.using(schema_editor.connection.alias).update(
+            **{f'{name}_count': Coalesce(Subquery(counts), 0)}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0012_newsletter_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_reaction_counts, migrations.RunPython.noop),
+    ]
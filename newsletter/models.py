@@ -1,5 +1,6 @@
 from django.db import models
 from accounts.models import CustomUser
+from hyper_news.models import DirtyFieldsMixin
 # from article.models import Publisher
 from django.contrib.auth import get_user_model
 
@@ -8,39 +9,53 @@ User = get_user_model()
 
 
 # Create your models here.
-class Newsletter(models.Model):
+class NewsletterQuerySet(models.QuerySet):
+    def cards(self):
+        """Only load the columns the newsletter card templates render (no `content`)."""
+        return self.select_related('journalist').only(
+            'id', 'title', 'description', 'image', 'created_at', 'updated_at',
+            'journalist__username',
+        )
+
+
+class Newsletter(DirtyFieldsMixin, models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     description = models.CharField(max_length=500)
     image = models.ImageField(upload_to='articles/', blank=True, null=True)
     publisher = models.ManyToManyField(CustomUser, 
-                                       limit_choices_to={'role': 'publisher'}, 
+                                       limit_choices_to={'position': 'publisher'}, 
                                        related_name='newsletters_pub')
     journalist = models.ForeignKey(CustomUser,
                                    on_delete=models.CASCADE, 
-                                   limit_choices_to={'role': 'journalist'}, 
+                                   limit_choices_to={'position': 'journalist'}, 
                                    related_name='newsletters_jour')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last save; versions the cached card fragments of the list templates
+    updated_at = models.DateTimeField(auto_now=True)
     approved = models.BooleanField(default=False)
     sentiment = models.CharField(max_length=20, default='Neutral')
     likes = models.ManyToManyField(User, related_name='newsletter_likes', blank=True)
     dislikes = models.ManyToManyField(User, related_name='newsletter_dislikes', blank=True)
+    # Denormalized sizes of `likes` / `dislikes`, maintained by comment.reactions
+    likes_count = models.PositiveIntegerField(default=0)
+    dislikes_count = models.PositiveIntegerField(default=0)
+
+    objects = NewsletterQuerySet.as_manager()
+    # The pre_save sentiment hook derives `sentiment` from `content`
+    dirty_dependencies = {'content': ['sentiment']}
     
     def __str__(self):
         return f"title:{self.title}, publisher:{self.publisher.name}"
     
-    @property
-    def likes_count(self):
-        return self.likes.count()
-
-    @property
-    def dislikes_count(self):
-        return self.dislikes.count()
-    
     class Meta:
         permissions = (
             ('newsletter_create', 'Can create newsletter'),
             ('newsletter_list', 'Can view newsletters'),
             ('newsletter_update', 'Can update newsletter'),
             ('newsletter_delete', 'Can delete newsletter'),
-        )
\ No newline at end of file
+        )
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='newsletter_created_id_idx'),
+            models.Index(fields=['sentiment'], name='newsletter_sentiment_idx'),
+        ]
\ No newline at end of file
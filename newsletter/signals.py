@@ -1,21 +1,14 @@
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
-from textblob import TextBlob
+from hyper_news.cache import track
+from sentiment.analysis import queue_sentiment
 from .models import Newsletter
 
 
+track(Newsletter)
 
-@receiver(pre_save, sender=Newsletter)
-def analyze_sentiment(sender, instance, **kwargs):
-    if instance.content:
-        analysis = TextBlob(instance.content)
-        polarity = analysis.sentiment.polarity  # ranges from -1 to 1
 
-        if polarity > 0.1:
-            instance.sentiment = "Positive"
-        elif polarity < -0.1:
-            instance.sentiment = "Negative"
-        else:
-            instance.sentiment = "Neutral"
-    else:
-        instance.sentiment = "Neutral"
\ No newline at end of file
+@receiver(pre_save, sender=Newsletter)
+def analyze_sentiment(sender, instance, update_fields=None, **kwargs):
+    """Queue the newsletter for background sentiment analysis (see `manage.py process_sentiment`)."""
+    queue_sentiment(instance, update_fields)
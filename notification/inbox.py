@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from .models import Notification
+
+
+UNREAD_KEY = 'notification:unread:{}'
+UNREAD_TIMEOUT = 60 * 60 * 24
+
+
+def unread_count(user):
+    """
+    Return the number of unread notifications of `user`. The count is kept in the
+    cache and adjusted as notifications are written and read, so the table is only
+    counted (through the inbox index) when the cached value has expired.
+    """
+    key = UNREAD_KEY.format(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(recipient=user, is_read=False).count()
+        cache.add(key, count, UNREAD_TIMEOUT)
+    return count
+
+
+def adjust_unread(deltas):
+    """Apply {user id: delta} changes to the cached unread counts that are present."""
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        key = UNREAD_KEY.format(user_id)
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # Not cached, or it expired in between. Delete the count an
+            # unread_count() running meanwhile may have added without this
+            # change; the next call counts from the table.
+            cache.delete(key)
+
+
+def forget_unread(user_ids):
+    """Drop the cached unread counts of `user_ids`; the next unread_count() calls count from the table."""
+    cache.delete_many([UNREAD_KEY.format(user_id) for user_id in set(user_ids)])
+
+
+def mark_read(user, ids=None):
+    """
+    Mark the unread notifications of `user` (or only those with a pk in `ids`) as
+    read with a single UPDATE. Returns the number of notifications marked.
+    """
+    notifications = Notification.objects.filter(recipient=user, is_read=False)
+    if ids is not None:
+        notifications = notifications.filter(pk__in=ids)
+    marked = notifications.update(is_read=True)
+    adjust_unread({user.pk: -marked})
+    return marked
@@ -0,0 +1,123 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from accounts.models import CustomUser
+from .models import QueuedEmail
+
+
+MAX_ATTEMPTS = 5
+# Seconds before the first retry; doubled after every failed attempt.
+RETRY_BACKOFF = 60
+# Seconds a worker owns the emails it claimed; a crashed worker's claim lapses after it.
+CLAIM_TIMEOUT = 600
+
+
+def subscriber_emails(article):
+    """
+    Email addresses of the readers subscribed to the article's journalist or
+    publisher that have no email queued about the article yet, in one query.
+    """
+    subscribed = Q(user_subscriptions__publisher__user_id=article.publisher_id)
+    if article.journalist_id:
+        subscribed |= Q(user_subscriptions__journalist=article.journalist_id)
+    queued = QueuedEmail.objects.filter(article=article, to=OuterRef('email'))
+    return list(CustomUser.objects
+                .filter(subscribed)
+                .exclude(email='')
+                .exclude(Exists(queued))
+                .values_list('email', flat=True)
+                .distinct())
+
+
+def queue_article_email(article):
+    """
+    Queue one 'new article' email per subscriber, skipping those already queued
+    for the article, so approving it again sends nothing twice. Returns the
+    number of emails queued.
+    """
+    emails = [
+        QueuedEmail(to=email,
+                    subject='New Article Published',
+                    body=f'New article "{article.title}" has been published.',
+                    article=article)
+        for email in subscriber_emails(article)
+    ]
+    QueuedEmail.objects.bulk_create(emails)
+    return len(emails)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def claim_due(batch_size, now):
+    """
+    Mark up to `batch_size` due emails as SENDING for CLAIM_TIMEOUT seconds and
+    return them. Rows locked by another worker's claim are skipped, so concurrent
+    workers never get the same email.
+    """
+    due = Q(status=QueuedEmail.PENDING) | Q(status=QueuedEmail.SENDING)
+    with transaction.atomic():
+        batch = list(QueuedEmail.objects
+                     .select_for_update(skip_locked=True)
+                     .filter(due, next_attempt_at__lte=now)
+                     .order_by('next_attempt_at', 'pk')[:batch_size])
+        claimed_until = now + timedelta(seconds=CLAIM_TIMEOUT)
+        QueuedEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            status=QueuedEmail.SENDING, next_attempt_at=claimed_until
+        )
+    for email in batch:
+        email.status = QueuedEmail.SENDING
+    return batch
+
+
+def send_queued(batch_size=100, connection=None):
+    """
+    Send one batch of due queued emails over a single backend connection.
+
+    The batch is claimed first (see claim_due), so several workers can drain the
+    queue at once. A message that fails is retried later with exponential backoff
+    and marked failed after MAX_ATTEMPTS; the connection is reopened after a
+    failure so one dropped SMTP session does not fail the rest of the batch.
+    Returns the number of emails attempted, 0 once nothing is due.
+    """
+    now = timezone.now()
+    batch = claim_due(batch_size, now)
+    if not batch:
+        return 0
+
+    connection = connection or get_connection()
+    from_email = settings.DEFAULT_FROM_EMAIL
+    try:
+        connection.open()
+        for email in batch:
+            message = EmailMessage(email.subject, email.body, from_email, [email.to], connection=connection)
+            try:
+                message.send()
+            except Exception as exc:
+                email.attempts += 1
+                email.last_error = str(exc)
+                if email.attempts >= MAX_ATTEMPTS:
+                    email.status = QueuedEmail.FAILED
+                else:
+                    email.status = QueuedEmail.PENDING
+                    email.next_attempt_at = now + retry_delay(email.attempts)
+                connection.close()
+                connection.open()
+            else:
+                email.attempts += 1
+                email.status = QueuedEmail.SENT
+                email.sent_at = timezone.now()
+    finally:
+        connection.close()
+        # Emails not attempted (the connection failed) go back to the queue, due right away.
+        for email in batch:
+            if email.status == QueuedEmail.SENDING:
+                email.status = QueuedEmail.PENDING
+        QueuedEmail.objects.bulk_update(
+            batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+        )
+    return len(batch)
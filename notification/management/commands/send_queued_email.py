@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from notification.mail import send_queued
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails in batches over one reused mail connection per batch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Emails sent per connection.')
+        parser.add_argument('--forever', action='store_true',
+                            help='Keep polling for new email instead of exiting once nothing is due.')
+        parser.add_argument('--sleep', type=float, default=5.0,
+                            help='Seconds to wait between polls when running with --forever.')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            try:
+                sent = send_queued(options['batch_size'])
+            except Exception as exc:
+                # The mail server is unreachable: keep the queue and try again later.
+                if not options['forever']:
+                    raise
+                self.stderr.write(f'Sending failed: {exc}')
+                sent = 0
+            total += sent
+            if sent:
+                self.stdout.write(f'Processed {sent} emails ({total} so far).')
+                continue
+            if not options['forever']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f'Email queue drained, {total} emails processed.'))
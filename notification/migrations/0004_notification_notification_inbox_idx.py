@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('article', '0014_article_article_sentiment_idx'),
+        ('newsletter', '0010_newsletter_newsletter_sentiment_idx'),
+        ('notification', '0003_notification_actor_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', 'created_at'], name='notification_inbox_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def record_unread_senders(apps, schema_editor):
+    """Record the last sender of each unread like/dislike notification as one of its actors."""
+    Notification = apps.get_model('notification', 'Notification')
+    NotificationActor = apps.get_model('notification', 'NotificationActor')
+    db = schema_editor.connection.alias
+    unread = (Notification.objects.using(db)
+              .filter(notification_type__in=['like', 'dislike'], is_read=False)
+              .values_list('pk', 'sender_id'))
+    NotificationActor.objects.using(db).bulk_create(
+        [NotificationActor(notification_id=pk, actor_id=sender_id) for pk, sender_id in unread.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0006_queuedemail_sending_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationActor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='actors', to='notification.notification')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('notification', 'actor'), name='notification_actor_uniq')],
+            },
+        ),
+        migrations.RunPython(record_unread_senders, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from article.models import Article
 from newsletter.models import Newsletter
 
@@ -11,8 +12,61 @@ class Notification(models.Model):
     newsletter = models.ForeignKey(Newsletter, on_delete=models.CASCADE, blank=True, null=True)
     notification_type = models.CharField(max_length=20)
     message = models.TextField()
+    # Number of people folded into an aggregated like/dislike notification
+    actor_count = models.PositiveIntegerField(default=1)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f'{self.notification_type} from {self.sender.username} to {self.recipient.username}'
\ No newline at end of file
+        return f'{self.notification_type} from {self.sender.username} to {self.recipient.username}'
+
+    class Meta:
+        indexes = [
+            # Serves the inbox: a recipient's (unread) notifications, newest first.
+            models.Index(fields=['recipient', 'is_read', 'created_at'], name='notification_inbox_idx'),
+        ]
+
+
+class NotificationActor(models.Model):
+    """A person folded into an aggregated like/dislike notification, counted once however often they toggle."""
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='actors')
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['notification', 'actor'], name='notification_actor_uniq'),
+        ]
+
+
+class QueuedEmail(models.Model):
+    """An outgoing email waiting for `manage.py send_queued_email`."""
+    PENDING = 'pending'
+    # Claimed by a send_queued_email worker until next_attempt_at
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    article = models.ForeignKey(Article, on_delete=models.SET_NULL, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f'{self.subject} to {self.to} ({self.status})'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='queuedemail_due_idx'),
+        ]
@@ -0,0 +1,183 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .inbox import adjust_unread
+from .models import Notification, NotificationActor
+
+
+# Reactions that are folded into one "N people liked X" notification per target.
+COALESCED_TYPES = {'like': 'liked', 'dislike': 'disliked'}
+
+
+class NotificationEvent:
+    """A notification waiting for the end of the current transaction."""
+
+    def __init__(self, recipient_id, sender_id, notification_type, target, message):
+        self.recipient_id = recipient_id
+        self.sender_id = sender_id
+        self.notification_type = notification_type
+        self.target_field = target._meta.model_name
+        self.target_id = target.pk
+        self.target_title = target.title
+        self.message = message
+
+    @property
+    def key(self):
+        return self.recipient_id, self.notification_type, self.target_field, self.target_id
+
+    def lookup(self):
+        return Q(recipient_id=self.recipient_id,
+                 notification_type=self.notification_type,
+                 **{f'{self.target_field}_id': self.target_id})
+
+    def aggregated_message(self, count):
+        return aggregated_message(self.notification_type, self.target_field, self.target_title, count)
+
+    def to_notification(self, count=1):
+        return Notification(
+            recipient_id=self.recipient_id,
+            sender_id=self.sender_id,
+            notification_type=self.notification_type,
+            message=self.message if count == 1 else self.aggregated_message(count),
+            actor_count=count,
+            **{f'{self.target_field}_id': self.target_id},
+        )
+
+
+def aggregated_message(notification_type, target_field, title, count):
+    verb = COALESCED_TYPES[notification_type]
+    return f'{count} people {verb} your {target_field}: {title}'
+
+
+def get_coalesce_window():
+    return timedelta(seconds=getattr(settings, 'NOTIFICATION_COALESCE_WINDOW', 3600))
+
+
+def notify(recipient, sender, notification_type, target, message):
+    """
+    Queue a notification about `target` (an Article or Newsletter) for `recipient`.
+
+    The event is written by flush() once the surrounding transaction commits, or
+    right away outside a transaction. Events queued in a transaction or savepoint
+    that rolls back are dropped with it, as Django discards its on_commit callbacks.
+    Nothing is sent when the target has no recipient (e.g. its journalist was deleted).
+    """
+    if recipient is None:
+        return
+    event = NotificationEvent(recipient.pk, sender.pk, notification_type, target, message)
+    transaction.on_commit(partial(flush, [event]), robust=False)
+
+
+def flush(events):
+    """
+    Write `events` with one bulk_create. Like/dislike events are grouped per
+    recipient and target, and a group is merged into the recipient's unread
+    notification of the same kind from within the coalescing window when there
+    is one, so a popular article produces one row instead of one per reaction.
+    The people folded into a notification are kept as NotificationActor rows, so
+    each of them is counted once however often they toggle their reaction.
+    """
+    if not events:
+        return
+    groups = {}
+    created = []
+    for event in events:
+        if event.notification_type in COALESCED_TYPES:
+            groups.setdefault(event.key, []).append(event)
+        else:
+            created.append(event.to_notification())
+
+    with transaction.atomic():
+        updated = []
+        actors = []
+        if groups:
+            lookup = Q()
+            for group in groups.values():
+                lookup |= group[0].lookup()
+            existing = {}
+            candidates = (Notification.objects
+                          .select_for_update()
+                          .filter(lookup, is_read=False, created_at__gte=timezone.now() - get_coalesce_window())
+                          .order_by('created_at'))
+            for notification in candidates:
+                existing[notification_key(notification)] = notification
+            known = defaultdict(set)
+            for notification_id, actor_id in (NotificationActor.objects
+                                              .filter(notification__in=existing.values())
+                                              .values_list('notification_id', 'actor_id')):
+                known[notification_id].add(actor_id)
+
+            for key, group in groups.items():
+                last = group[-1]
+                senders = list(dict.fromkeys(event.sender_id for event in group))
+                notification = existing.get(key)
+                if notification is None:
+                    # Saved one by one: the actor rows need its primary key, which
+                    # bulk_create does not set on every backend.
+                    notification = last.to_notification(len(senders))
+                    notification.save()
+                    created.append(notification)
+                else:
+                    senders = [sender_id for sender_id in senders if sender_id not in known[notification.pk]]
+                    if not senders:
+                        continue
+                    notification.actor_count += len(senders)
+                    notification.sender_id = senders[-1]
+                    notification.message = last.aggregated_message(notification.actor_count)
+                    updated.append(notification)
+                actors.extend(NotificationActor(notification=notification, actor_id=sender_id)
+                              for sender_id in senders)
+
+        if updated:
+            Notification.objects.bulk_update(updated, ['actor_count', 'sender', 'message'])
+        if actors:
+            NotificationActor.objects.bulk_create(actors, ignore_conflicts=True)
+        new = [notification for notification in created if notification.pk is None]
+        if new:
+            Notification.objects.bulk_create(new)
+    adjust_unread(Counter(notification.recipient_id for notification in created))
+
+
+def retract(recipient, sender, notification_type, target):
+    """
+    Take `sender` back out of the recipient's unread like/dislike notification
+    about `target` when they undo their reaction. The notification is deleted
+    when nobody is left in it. Call it in the transaction that removes the reaction.
+    """
+    if recipient is None:
+        return
+    target_field = target._meta.model_name
+    with transaction.atomic():
+        notification = (Notification.objects
+                        .select_for_update()
+                        .filter(recipient=recipient, notification_type=notification_type, is_read=False,
+                                actors__actor=sender, **{target_field: target})
+                        .order_by('-created_at')
+                        .first())
+        if notification is None:
+            return
+        NotificationActor.objects.filter(notification=notification, actor=sender).delete()
+        notification.actor_count -= 1
+        if not notification.actor_count:
+            notification.delete()
+            return
+        if notification.sender_id == sender.pk:
+            notification.sender_id = (notification.actors.order_by('-pk')
+                                      .values_list('actor_id', flat=True).first()) or sender.pk
+        if notification.actor_count == 1:
+            verb = COALESCED_TYPES[notification_type]
+            notification.message = f'{notification.sender.username} {verb} your {target_field}: {target.title}'
+        else:
+            notification.message = aggregated_message(notification_type, target_field, target.title,
+                                                      notification.actor_count)
+        notification.save(update_fields=['actor_count', 'sender', 'message'])
+
+
+def notification_key(notification):
+    target_field = 'article' if notification.article_id else 'newsletter'
+    target_id = notification.article_id or notification.newsletter_id
+    return notification.recipient_id, notification.notification_type, target_field, target_id
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    sender = serializers.CharField(source='sender.username', read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = ['id',
+                  'notification_type',
+                  'message',
+                  'sender',
+                  'article',
+                  'newsletter',
+                  'actor_count',
+                  'is_read',
+                  'created_at']
@@ -0,0 +1,24 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from article.signals import article_approved
+from .inbox import forget_unread
+from .mail import queue_article_email
+from .models import Notification
+
+
+@receiver(article_approved)
+def email_subscribers(sender, article, **kwargs):
+    """Queue the 'new article' email for subscribers (sent by `manage.py send_queued_email`)."""
+    queue_article_email(article)
+
+
+@receiver(post_delete, sender=Notification)
+def forget_deleted_unread(sender, instance, **kwargs):
+    """
+    Drop the recipient's cached unread count when an unread notification is
+    deleted, including through a cascade from its article, newsletter or sender.
+    """
+    if not instance.is_read:
+        transaction.on_commit(partial(forget_unread, [instance.recipient_id]))
@@ -1,3 +1,216 @@
+from datetime import timedelta
+from unittest import mock
+from django.core import mail
+from django.db import transaction
 from django.test import TestCase
+from django.utils import timezone
+from django.urls import reverse
+from accounts.models import CustomUser
+from article.models import Article
+from reader.models import Subscriptions
+from . import inbox
+from .inbox import unread_count
+from .mail import CLAIM_TIMEOUT, claim_due, queue_article_email, send_queued
+from .models import Notification, QueuedEmail
+from .pipeline import get_coalesce_window, notify
+
 
 # Create your tests here.
+class MarkReadAPITests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('journalist', password='pass', position='journalist')
+        sender = CustomUser.objects.create_user('reader', password='pass')
+        self.notifications = [
+            Notification.objects.create(recipient=self.user, sender=sender, notification_type='like',
+                                        message=f'Notification {i}')
+            for i in range(3)
+        ]
+        self.client.force_login(self.user)
+        self.url = reverse('notification_mark_read_api')
+
+    def unread(self):
+        return Notification.objects.filter(recipient=self.user, is_read=False).count()
+
+    def test_json_ids(self):
+        response = self.client.post(self.url, {'ids': [self.notifications[0].pk]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['marked'], 1)
+        self.assertEqual(self.unread(), 2)
+
+    def test_form_ids(self):
+        response = self.client.post(self.url, {'ids': [self.notifications[0].pk, self.notifications[1].pk]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.unread(), 1)
+
+    def test_all(self):
+        response = self.client.post(self.url, {'ids': None}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.unread(), 0)
+
+    def test_invalid_ids(self):
+        for ids in (5, '5', [1, 'x'], [True]):
+            response = self.client.post(self.url, {'ids': ids}, content_type='application/json')
+            self.assertEqual(response.status_code, 400, ids)
+        response = self.client.post(self.url, {'ids': ['x']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.unread(), 3)
+
+
+class PipelineTests(TestCase):
+    def setUp(self):
+        self.journalist = CustomUser.objects.create_user('journalist', password='pass', position='journalist')
+        self.reader = CustomUser.objects.create_user('reader', password='pass')
+        self.article = Article.objects.create(title='Title', description='d', content='c',
+                                              publisher=self.journalist, journalist=self.journalist)
+
+    def notify(self, message):
+        notify(self.journalist, self.reader, 'comment', self.article, message)
+
+    def messages(self):
+        return list(Notification.objects.order_by('pk').values_list('message', flat=True))
+
+    def test_events_of_a_rolled_back_transaction_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.notify('lost')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            with transaction.atomic():
+                self.notify('kept')
+        self.assertEqual(self.messages(), ['kept'])
+
+    def test_events_of_a_rolled_back_savepoint_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.notify('before')
+                try:
+                    with transaction.atomic():
+                        self.notify('lost')
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                self.notify('after')
+        self.assertEqual(self.messages(), ['before', 'after'])
+
+    def test_reactions_are_buffered_until_commit(self):
+        self.client.force_login(self.reader)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('like_article', args=[self.article.pk]))
+            self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(self.messages(), ['reader liked your article: Title'])
+
+    def toggle_like(self, user):
+        self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('like_article', args=[self.article.pk]))
+
+    def test_distinct_likers_are_merged(self):
+        readers = [self.reader] + [CustomUser.objects.create_user(f'reader{i}', password='pass') for i in range(2)]
+        for reader in readers:
+            self.toggle_like(reader)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.actor_count, 3)
+        self.assertEqual(notification.sender, readers[-1])
+        self.assertEqual(notification.message, '3 people liked your article: Title')
+        self.assertEqual(notification.actors.count(), 3)
+
+    def test_toggling_liker_is_counted_once(self):
+        other = CustomUser.objects.create_user('other', password='pass')
+        self.toggle_like(other)
+        for _ in range(5):
+            self.toggle_like(self.reader)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.actor_count, 2)
+        self.assertEqual(notification.message, '2 people liked your article: Title')
+        # Unliking takes the reader back out of the notification, and the last
+        # unlike removes it.
+        self.toggle_like(self.reader)
+        notification.refresh_from_db()
+        self.assertEqual(notification.actor_count, 1)
+        self.assertEqual(notification.sender, other)
+        self.assertEqual(notification.message, 'other liked your article: Title')
+        self.toggle_like(other)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_likes_outside_the_window_start_a_new_notification(self):
+        other = CustomUser.objects.create_user('other', password='pass')
+        self.toggle_like(other)
+        Notification.objects.update(created_at=timezone.now() - get_coalesce_window() - timedelta(minutes=1))
+        self.toggle_like(self.reader)
+        self.assertEqual(self.messages(), ['other liked your article: Title', 'reader liked your article: Title'])
+        self.assertEqual(list(Notification.objects.values_list('actor_count', flat=True)), [1, 1])
+
+
+class UnreadCountTests(TestCase):
+    def setUp(self):
+        self.journalist = CustomUser.objects.create_user('journalist', password='pass', position='journalist')
+        self.reader = CustomUser.objects.create_user('reader', password='pass')
+        self.article = Article.objects.create(title='Title', description='d', content='c',
+                                              publisher=self.journalist, journalist=self.journalist)
+        with self.captureOnCommitCallbacks(execute=True):
+            notify(self.journalist, self.reader, 'comment', self.article, 'commented')
+
+    def test_cascade_delete_drops_the_cached_count(self):
+        self.assertEqual(unread_count(self.journalist), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.delete()
+        self.assertEqual(unread_count(self.journalist), 0)
+
+    def test_missed_increment_drops_the_cached_count(self):
+        key = inbox.UNREAD_KEY.format(self.journalist.pk)
+
+        def missed_incr(key, delta):
+            # Another request's unread_count() counted before the change and
+            # caches its result just after the increment missed.
+            inbox.cache.add(key, 0)
+            raise ValueError
+
+        inbox.cache.delete(key)
+        with mock.patch.object(inbox.cache, 'incr', side_effect=missed_incr):
+            inbox.adjust_unread({self.journalist.pk: 1})
+        self.assertEqual(unread_count(self.journalist), 1)
+
+class QueuedEmailTests(TestCase):
+    def setUp(self):
+        for i in range(3):
+            QueuedEmail.objects.create(to=f'reader{i}@example.com', subject='New', body='Body')
+
+    def test_claimed_emails_are_not_claimed_again(self):
+        now = timezone.now()
+        first = claim_due(2, now)
+        second = claim_due(2, now)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({email.pk for email in first} & {email.pk for email in second})
+        self.assertEqual(claim_due(2, now), [])
+        # A worker that died keeps its claim only until CLAIM_TIMEOUT.
+        self.assertEqual(len(claim_due(5, now + timedelta(seconds=CLAIM_TIMEOUT + 1))), 3)
+
+    def test_send_queued_sends_each_email_once(self):
+        self.assertEqual(send_queued(batch_size=10), 3)
+        self.assertEqual(send_queued(batch_size=10), 0)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(QueuedEmail.objects.filter(status=QueuedEmail.SENT).count(), 3)
+
+    def test_unsent_claims_are_released(self):
+        connection = mock.Mock()
+        connection.open.side_effect = OSError('unreachable')
+        with self.assertRaises(OSError):
+            send_queued(batch_size=10, connection=connection)
+        self.assertEqual(QueuedEmail.objects.filter(status=QueuedEmail.PENDING,
+                                                    next_attempt_at__lte=timezone.now()).count(), 3)
+
+    def test_article_emails_are_queued_once_per_subscriber(self):
+        journalist = CustomUser.objects.create_user('journalist', password='pass', position='journalist')
+        article = Article.objects.create(title='Title', description='d', content='c',
+                                         publisher=journalist, journalist=journalist)
+        for name in ('first', 'second'):
+            reader = CustomUser.objects.create_user(name, email=f'{name}@example.com', password='pass')
+            Subscriptions.objects.create(user=reader).journalist.add(journalist)
+            self.assertEqual(queue_article_email(article), 1)
+        # Approving the article again queues nothing new.
+        self.assertEqual(queue_article_email(article), 0)
+        self.assertEqual(sorted(QueuedEmail.objects.filter(article=article).values_list('to', flat=True)),
+                         ['first@example.com', 'second@example.com'])
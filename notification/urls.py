@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('api/notifications/', views.Notification_Inbox_API.as_view(), name='notification_inbox_api'),
+    path('api/notifications/read/', views.Notification_Mark_Read_API.as_view(), name='notification_mark_read_api'),
+    path('notifications/read/', views.mark_all_read, name='notification_mark_all_read'),
+]
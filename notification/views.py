@@ -1,3 +1,67 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.http import QueryDict
+from django.shortcuts import redirect
+from django.views.decorators.http import require_POST
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from hyper_news.pagination import keyset_paginate
+from .inbox import mark_read, unread_count
+from .models import Notification
+from .serializers import NotificationSerializer
+
 
 # Create your views here.
+class Notification_Inbox_API(APIView):
+    """
+    The user's notifications, newest first, one keyset page at a time.
+    Pass `?unread=1` for unread notifications only and `?cursor=` with the
+    `next_cursor` of the previous page to read on.
+    """
+    permission_classes = [IsAuthenticated]
+    page_size = 20
+
+    def get(self, request):
+        notifications = (Notification.objects
+                         .filter(recipient=request.user)
+                         .select_related('sender'))
+        if request.query_params.get('unread'):
+            notifications = notifications.filter(is_read=False)
+        page = keyset_paginate(notifications, request.query_params.get('cursor'), self.page_size)
+        return Response({
+            'results': NotificationSerializer(page.object_list, many=True).data,
+            'next_cursor': page.next_cursor,
+            'unread_count': unread_count(request.user),
+        })
+
+
+class Notification_Mark_Read_API(APIView):
+    """Mark the notifications listed in `ids`, or all of them when it is omitted, as read."""
+    permission_classes = [IsAuthenticated]
+
+    def get_ids(self, data):
+        """The notification ids to mark: a JSON list of ints or repeated form fields, or None."""
+        if data.get('ids') is None:
+            return None
+        if isinstance(data, QueryDict):
+            ids = data.getlist('ids')
+            if all(pk.isdigit() for pk in ids):
+                return [int(pk) for pk in ids]
+        else:
+            ids = data['ids']
+            if isinstance(ids, list) and all(type(pk) is int for pk in ids):
+                return ids
+        raise ValidationError({'ids': 'Must be a list of notification ids.'})
+
+    def post(self, request):
+        ids = self.get_ids(request.data)
+        marked = mark_read(request.user, ids)
+        return Response({'marked': marked, 'unread_count': unread_count(request.user)})
+
+
+@login_required
+@require_POST
+def mark_all_read(request):
+    mark_read(request.user)
+    return redirect('journalist_dashboard')
@@ -0,0 +1,19 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from accounts.models import CustomUser
+from reader.timeline import HEAVY_SOURCES_KEY, PREVIOUS_HEAVY_SOURCES_KEY, rebuild
+
+
+class Command(BaseCommand):
+    help = ('Rebuild every reader timeline from their subscriptions, e.g. after changing '
+            'TIMELINE_MAX_ENTRIES or TIMELINE_FANOUT_LIMIT.')
+
+    def handle(self, *args, **options):
+        # Every timeline is rebuilt here, so there are no demotions left to catch up on.
+        cache.delete_many([HEAVY_SOURCES_KEY, PREVIOUS_HEAVY_SOURCES_KEY])
+        readers = CustomUser.objects.filter(user_subscriptions__isnull=False).distinct()
+        total = 0
+        for reader in readers.iterator():
+            rebuild(reader)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} timelines.'))
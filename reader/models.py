@@ -1,6 +1,6 @@
 from django.db import models
 from accounts.models import CustomUser
-from article.models import Publisher
+from article.models import Article, Publisher
 
 
 # Create your models here.
@@ -21,4 +21,30 @@ class Subscriptions(models.Model):
                                   on_delete=models.CASCADE)
     
     def __str__(self):
-        return f"{self.user} has subscribed to {self.journalist}"
\ No newline at end of file
+        return f"{self.user} has subscribed to {self.journalist}"
+
+
+class TimelineEntry(models.Model):
+    """
+    An approved article pushed to the timeline of one subscribed reader.
+    `created_at` is copied from the article so a reader's feed is a single range
+    scan of the (reader, created_at, article) index.
+    """
+    reader = models.ForeignKey(CustomUser,
+                               on_delete=models.CASCADE,
+                               related_name='timeline_entries')
+    article = models.ForeignKey(Article,
+                                on_delete=models.CASCADE,
+                                related_name='timeline_entries')
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"article:{self.article_id} in the timeline of {self.reader_id}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['reader', 'article'], name='timeline_reader_article_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['reader', 'created_at', 'article'], name='timeline_reader_created_idx'),
+        ]
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+from article.models import Article
+
+
+class FeedArticleSerializer(serializers.ModelSerializer):
+    """Read-only feed entry; relies on the journalist/publisher being select_related."""
+    journalist = serializers.CharField(source='journalist.username', default=None, read_only=True)
+    publisher = serializers.CharField(source='publisher.username', read_only=True)
+
+    class Meta:
+        model = Article
+        fields = ['id',
+                  'title',
+                  'description',
+                  'journalist',
+                  'publisher',
+                  'sentiment',
+                  'likes_count',
+                  'dislikes_count',
+                  'created_at']
+        read_only_fields = fields
@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from accounts.models import CustomUser
+from article.signals import article_approved, article_unapproved
+from .models import Subscriptions, TimelineEntry
+from .timeline import fan_out, rebuild
+
+
+@receiver(article_approved)
+def push_to_timelines(sender, article, **kwargs):
+    fan_out(article)
+
+
+@receiver(article_unapproved)
+def remove_from_timelines(sender, article, **kwargs):
+    TimelineEntry.objects.filter(article_id=article.pk).delete()
+
+
+def rebuild_on_commit(user_id):
+    """Rebuild the timeline of reader `user_id` once the subscription change is committed."""
+    def rebuild_if_exists():
+        # The subscription may have been deleted along with its reader.
+        reader = CustomUser.objects.filter(pk=user_id).first()
+        if reader is not None:
+            rebuild(reader)
+    transaction.on_commit(rebuild_if_exists)
+
+
+@receiver(post_save, sender=Subscriptions)
+@receiver(post_delete, sender=Subscriptions)
+def rebuild_on_subscription_change(sender, instance, **kwargs):
+    rebuild_on_commit(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Subscriptions.journalist.through)
+def rebuild_on_journalist_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            rebuild_on_commit(instance.user_id)
+        return
+    # journalist.journalist_subscriptions.add(...): pk_set holds Subscriptions ids,
+    # and clear() gives none, so the affected subscriptions are read before it.
+    if action == 'pre_clear':
+        pk_set = set(instance.journalist_subscriptions.values_list('pk', flat=True))
+    elif action not in ('post_add', 'post_remove'):
+        return
+    for user_id in Subscriptions.objects.filter(pk__in=pk_set or ()).values_list('user_id', flat=True).distinct():
+        rebuild_on_commit(user_id)
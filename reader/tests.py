@@ -1,3 +1,94 @@
-from django.test import TestCase
+import json
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from accounts.models import CustomUser
+from article.models import Article, Publisher
+from .models import Subscriptions, TimelineEntry
+from .timeline import HEAVY_SOURCES_KEY, heavy_sources
+
 
 # Create your tests here.
+class SubscriptionFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.journalist = CustomUser.objects.create_user('journalist', password='pass', position='journalist')
+        owner = CustomUser.objects.create_user('owner', password='pass', position='publisher')
+        self.publisher = Publisher.objects.create(user=owner, name='Daily')
+        self.reader = CustomUser.objects.create_user('reader', password='pass', position='reader')
+
+        subscription = self.subscription = Subscriptions.objects.create(user=self.reader)
+        subscription.journalist.add(self.journalist)
+        Subscriptions.objects.create(user=self.reader, publisher=self.publisher)
+
+        other = CustomUser.objects.create_user('other', password='pass', position='journalist')
+        for i in range(15):
+            author = self.journalist if i % 3 else other
+            with self.captureOnCommitCallbacks(execute=True):
+                Article.objects.create(title=f'Article {i}', description='d', content='c',
+                                       publisher=owner if i % 5 == 0 else other,
+                                       journalist=author, approved=True)
+        Article.objects.create(title='Draft', description='d', content='c',
+                               publisher=owner, journalist=self.journalist)
+        self.client.force_login(self.reader)
+
+    def get_feed(self, **params):
+        response = self.client.get(reverse('subscription_feed_api'), params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_feed_contains_approved_subscribed_articles(self):
+        feed = self.get_feed(page_size=100)
+        expected = [f'Article {i}' for i in reversed(range(15)) if i % 3 or i % 5 == 0]
+        self.assertEqual([article['title'] for article in feed['results']], expected)
+        self.assertIsNone(feed['next_cursor'])
+
+    def test_cursor_pagination(self):
+        first = self.get_feed(page_size=4)
+        second = self.get_feed(page_size=4, cursor=first['next_cursor'])
+        titles = [article['title'] for article in first['results'] + second['results']]
+        self.assertEqual(len(titles), 8)
+        self.assertEqual(len(set(titles)), 8)
+
+    def test_query_budget(self):
+        heavy_sources()  # warm the cached list of fan-out-on-read sources
+        # Session and user lookups for authentication, then one query for the page.
+        with self.assertNumQueries(3):
+            self.get_feed(page_size=20)
+
+    def feed_titles(self):
+        return [article['title'] for article in self.get_feed(page_size=100)['results']]
+
+    def test_unapproved_article_leaves_timelines(self):
+        article = Article.objects.get(title='Article 14')
+        article.approved = False
+        with self.captureOnCommitCallbacks(execute=True):
+            article.save()
+        self.assertFalse(TimelineEntry.objects.filter(article=article).exists())
+        self.assertNotIn('Article 14', self.feed_titles())
+
+    def test_deleting_journalist_subscription_rebuilds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subscription.delete()
+        self.assertEqual(self.feed_titles(), ['Article 10', 'Article 5', 'Article 0'])
+
+    def test_clearing_journalist_subscribers_rebuilds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.journalist.journalist_subscriptions.clear()
+        self.assertEqual(self.feed_titles(), ['Article 10', 'Article 5', 'Article 0'])
+
+    def test_demoted_source_is_backfilled(self):
+        with override_settings(TIMELINE_FANOUT_LIMIT=0):
+            cache.delete(HEAVY_SOURCES_KEY)
+            self.assertIn(self.journalist.pk, heavy_sources()[0])
+            with self.captureOnCommitCallbacks(execute=True):
+                article = Article.objects.create(title='Pulled', description='d', content='c',
+                                                 publisher=self.journalist, journalist=self.journalist,
+                                                 approved=True)
+            self.assertFalse(TimelineEntry.objects.filter(article=article).exists())
+            self.assertIn('Pulled', self.feed_titles())
+        # The journalist falls back under the limit when the list is refreshed.
+        cache.delete(HEAVY_SOURCES_KEY)
+        self.assertNotIn(self.journalist.pk, heavy_sources()[0])
+        self.assertTrue(TimelineEntry.objects.filter(reader=self.reader, article=article).exists())
+        self.assertEqual(self.feed_titles()[0], 'Pulled')
@@ -0,0 +1,208 @@
+"""
+Materialized reader timelines.
+
+Approved articles are pushed into the timelines of the journalist's and
+publisher's subscribers (fan-out on write), keeping the newest
+TIMELINE_MAX_ENTRIES per reader. Journalists and publishers followed by more
+than TIMELINE_FANOUT_LIMIT readers are not fanned out; their articles are
+merged into the feed when it is read (fan-out on read) instead. When such a
+source drops back under the limit, the timelines of its readers are rebuilt,
+so its articles from its fan-out-on-read period stay in their feeds.
+"""
+from itertools import islice
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from accounts.models import CustomUser
+from article.models import Article
+from hyper_news.pagination import DEFAULT_PAGE_SIZE, KeysetPage, encode_cursor, keyset_paginate
+from .models import Subscriptions, TimelineEntry
+
+
+HEAVY_SOURCES_KEY = 'reader:timeline:heavy_sources'
+# The last computed heavy sources, kept without expiry to detect demotions.
+PREVIOUS_HEAVY_SOURCES_KEY = 'reader:timeline:heavy_sources:previous'
+HEAVY_SOURCES_TIMEOUT = 60 * 10
+BATCH_SIZE = 1000
+
+
+def get_max_entries():
+    return getattr(settings, 'TIMELINE_MAX_ENTRIES', 500)
+
+
+def get_fanout_limit():
+    return getattr(settings, 'TIMELINE_FANOUT_LIMIT', 5000)
+
+
+def heavy_sources():
+    """
+    Return the (journalist ids, publisher user ids) followed by more readers than
+    the fan-out limit. Computed with two aggregate queries and cached for a while;
+    sources that are no longer heavy on recompute get their readers rebuilt.
+    """
+    sources = cache.get(HEAVY_SOURCES_KEY)
+    if sources is None:
+        limit = get_fanout_limit()
+        journalists = (CustomUser.objects
+                       .annotate(followers=Count('journalist_subscriptions__user', distinct=True))
+                       .filter(followers__gt=limit)
+                       .values_list('id', flat=True))
+        publishers = (Subscriptions.objects
+                      .filter(publisher__isnull=False)
+                      .values('publisher__user_id')
+                      .annotate(followers=Count('user', distinct=True))
+                      .filter(followers__gt=limit)
+                      .values_list('publisher__user_id', flat=True))
+        sources = (frozenset(journalists), frozenset(publishers))
+        cache.set(HEAVY_SOURCES_KEY, sources, HEAVY_SOURCES_TIMEOUT)
+        previous = cache.get(PREVIOUS_HEAVY_SOURCES_KEY)
+        cache.set(PREVIOUS_HEAVY_SOURCES_KEY, sources, None)
+        if previous is not None:
+            rebuild_demoted(previous[0] - sources[0], previous[1] - sources[1])
+    return sources
+
+
+def rebuild_demoted(journalists, publishers):
+    """
+    Rebuild the timelines of the readers of `journalists` and `publishers`, which
+    were fanned out on read and are fanned out on write again: their articles
+    approved in between were never pushed. Returns the number of readers.
+    """
+    if not journalists and not publishers:
+        return 0
+    readers = CustomUser.objects.filter(
+        pk__in=Subscriptions.objects
+        .filter(Q(journalist__in=journalists) | Q(publisher__user_id__in=publishers))
+        .values('user_id')
+    )
+    total = 0
+    for reader in readers.iterator(chunk_size=BATCH_SIZE):
+        rebuild(reader)
+        total += 1
+    return total
+
+
+def subscriber_ids(article):
+    """Ids of the readers whose timeline receives `article` on approval."""
+    heavy_journalists, heavy_publishers = heavy_sources()
+    subscribed = Q()
+    if article.journalist_id and article.journalist_id not in heavy_journalists:
+        subscribed |= Q(journalist=article.journalist_id)
+    if article.publisher_id not in heavy_publishers:
+        subscribed |= Q(publisher__user_id=article.publisher_id)
+    if not subscribed:
+        return Subscriptions.objects.none().values_list('user_id', flat=True)
+    return Subscriptions.objects.filter(subscribed).values_list('user_id', flat=True).distinct()
+
+
+def fan_out(article):
+    """Push an approved article to its subscribers' timelines in bulk. Returns the number of readers."""
+    readers = subscriber_ids(article).iterator(chunk_size=BATCH_SIZE)
+    total = 0
+    while True:
+        batch = list(islice(readers, BATCH_SIZE))
+        if not batch:
+            return total
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(reader_id=reader_id, article_id=article.pk, created_at=article.created_at)
+             for reader_id in batch],
+            ignore_conflicts=True,
+        )
+        trim(batch)
+        total += len(batch)
+
+
+def trim(reader_ids):
+    """
+    Cut the timelines of `reader_ids` back to the newest TIMELINE_MAX_ENTRIES.
+    Timelines may run 10% over before they are trimmed, so a fan-out only
+    deletes for a small share of the readers it touched.
+    """
+    max_entries = get_max_entries()
+    full = (TimelineEntry.objects
+            .filter(reader_id__in=reader_ids)
+            .values('reader_id')
+            .annotate(entries=Count('id'))
+            .filter(entries__gt=max_entries + max_entries // 10)
+            .values_list('reader_id', flat=True))
+    for reader_id in full:
+        entries = TimelineEntry.objects.filter(reader_id=reader_id)
+        oldest_kept = entries.order_by('-created_at', '-article_id')[max_entries - 1]
+        entries.filter(
+            Q(created_at__lt=oldest_kept.created_at)
+            | Q(created_at=oldest_kept.created_at, article_id__lt=oldest_kept.article_id)
+        ).delete()
+
+
+def followed_sources(reader):
+    """Return the (journalist ids, publisher user ids) `reader` is subscribed to."""
+    journalists, publishers = set(), set()
+    for journalist_id, publisher_user_id in (Subscriptions.objects
+                                             .filter(user=reader)
+                                             .values_list('journalist', 'publisher__user_id')):
+        if journalist_id:
+            journalists.add(journalist_id)
+        if publisher_user_id:
+            publishers.add(publisher_user_id)
+    return journalists, publishers
+
+
+def rebuild(reader):
+    """Recompute the timeline of `reader` from their subscriptions, e.g. after they change."""
+    heavy_journalists, heavy_publishers = heavy_sources()
+    journalists, publishers = followed_sources(reader)
+    journalists -= heavy_journalists
+    publishers -= heavy_publishers
+
+    TimelineEntry.objects.filter(reader=reader).delete()
+    if not journalists and not publishers:
+        return
+    articles = (Article.objects
+                .filter(approved=True)
+                .filter(Q(journalist_id__in=journalists) | Q(publisher_id__in=publishers))
+                .order_by('-created_at', '-id')
+                .values_list('id', 'created_at')[:get_max_entries()])
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(reader=reader, article_id=pk, created_at=created_at) for pk, created_at in articles],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def timeline_page(reader, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return a KeysetPage of the approved articles in the feed of `reader`, newest first.
+    Cursors are (created_at, article id) positions, shared by both fan-out paths.
+    """
+    entries = keyset_paginate(
+        TimelineEntry.objects
+        .filter(reader=reader, article__approved=True)
+        .select_related('article__journalist', 'article__publisher'),
+        cursor, page_size, id_field='article_id',
+    )
+    feed = [entry.article for entry in entries]
+
+    heavy_journalists, heavy_publishers = heavy_sources()
+    if not heavy_journalists and not heavy_publishers:
+        return KeysetPage(feed, entries.next_cursor)
+
+    journalists, publishers = followed_sources(reader)
+    journalists &= heavy_journalists
+    publishers &= heavy_publishers
+    if not journalists and not publishers:
+        return KeysetPage(feed, entries.next_cursor)
+
+    pulled = keyset_paginate(
+        Article.objects
+        .filter(approved=True)
+        .filter(Q(journalist_id__in=journalists) | Q(publisher_id__in=publishers))
+        .select_related('journalist', 'publisher'),
+        cursor, page_size,
+    )
+    merged = {article.pk: article for article in feed}
+    merged.update((article.pk, article) for article in pulled)
+    feed = sorted(merged.values(), key=lambda article: (article.created_at, article.pk), reverse=True)
+    has_next = entries.has_next or pulled.has_next or len(feed) > page_size
+    feed = feed[:page_size]
+    next_cursor = encode_cursor(feed[-1].created_at, feed[-1].pk) if has_next and feed else None
+    return KeysetPage(feed, next_cursor)
@@ -6,5 +6,6 @@ urlpatterns = [
     path('subscriptions_journalist/<int:pk>/', views.subscriptions_journalist, name='subscriptions_journalist'),
     path('subscriptions_publisher/<int:pk>/', views.subscriptions_publisher, name='subscriptions_publisher'),
     path('bookmarks/', views.reader_bookmarks, name='reader_bookmarks'),
+    path('api/feed/', views.SubscriptionView.as_view(), name='subscription_feed_api'),
 ]
 
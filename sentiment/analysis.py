@@ -0,0 +1,108 @@
+from django.apps import apps
+from django.conf import settings
+from .cache import sentiment_cache
+from .scoring import DEFAULT_BACKEND, combine, content_hash, paragraph_weight, score_batch, split_paragraphs
+
+
+POSITIVE = 'Positive'
+NEGATIVE = 'Negative'
+NEUTRAL = 'Neutral'
+PENDING = 'Pending'
+
+# Polarity ranges from -1 to 1; anything within the thresholds is Neutral.
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+# Models whose `content` is scored into a `sentiment` column.
+SENTIMENT_MODELS = ('article.Article', 'newsletter.Newsletter')
+
+
+def get_backend_path():
+    return getattr(settings, 'SENTIMENT_BACKEND', DEFAULT_BACKEND)
+
+
+def label_for(polarity):
+    if polarity > POSITIVE_THRESHOLD:
+        return POSITIVE
+    elif polarity < NEGATIVE_THRESHOLD:
+        return NEGATIVE
+    return NEUTRAL
+
+
+def cached_paragraphs(text):
+    """
+    Split `text` into paragraphs and look their content hashes up in the cache.
+    Returns the paragraphs, their hashes and a {hash: polarity} dict of the cached ones.
+    """
+    paragraphs = split_paragraphs(text)
+    keys = [content_hash(paragraph) for paragraph in paragraphs]
+    return paragraphs, keys, sentiment_cache.get_many(keys)
+
+
+def combined_polarity(paragraphs, keys, polarities):
+    return combine([polarities[key] for key in keys], [paragraph_weight(p) for p in paragraphs])
+
+
+def polarity_of(text):
+    """
+    Return the polarity of `text`, combined from the polarities of its paragraphs.
+    Only paragraphs whose content hash is not cached yet are scored, so re-analysing
+    an edited article costs as much as the paragraphs that changed.
+    """
+    paragraphs, keys, polarities = cached_paragraphs(text)
+    missing = list(dict.fromkeys(p for p, key in zip(paragraphs, keys) if key not in polarities))
+    if missing:
+        results = score_batch(missing, get_backend_path())
+        sentiment_cache.set_many(results)
+        polarities.update(results)
+    return combined_polarity(paragraphs, keys, polarities)
+
+
+def analyze(text):
+    """Return the sentiment label of `text`."""
+    if not text:
+        return NEUTRAL
+    return label_for(polarity_of(text))
+
+
+def queue_sentiment(instance, update_fields=None):
+    """
+    Label `instance` from the cache, or mark it for background analysis instead of
+    scoring it on the request thread. Called from pre_save; saves that do not write
+    `content`, or write it unchanged, leave the sentiment untouched.
+    """
+    if update_fields is not None and 'content' not in update_fields:
+        return
+    if not instance.is_dirty('content'):
+        return
+    if not instance.content:
+        instance.sentiment = NEUTRAL
+        return
+    paragraphs, keys, polarities = cached_paragraphs(instance.content)
+    if all(key in polarities for key in keys):
+        instance.sentiment = label_for(combined_polarity(paragraphs, keys, polarities))
+    else:
+        instance.sentiment = PENDING
+
+
+def process_pending(batch_size=100):
+    """
+    Score one batch of pending rows for every sentiment model.
+    Returns the number of rows processed, 0 once the queue is drained.
+
+    A label is only written while the row is still pending with the content that
+    was scored, so a row edited meanwhile stays queued for its new content.
+    """
+    processed = 0
+    for label in SENTIMENT_MODELS:
+        model = apps.get_model(label)
+        rows = (model.objects
+                .filter(sentiment=PENDING)
+                .only('pk', 'content', 'sentiment')
+                .order_by('pk')[:batch_size])
+        for row in rows:
+            (model.objects
+             .filter(pk=row.pk, sentiment=PENDING, content=row.content)
+             .update(sentiment=analyze(row.content)))
+            processed += 1
+    return processed
@@ -0,0 +1,156 @@
+"""
+Pluggable sentiment backends. A backend turns texts into polarities in [-1, 1];
+the label thresholds live in sentiment.analysis and are shared by every backend.
+Select one with the SENTIMENT_BACKEND setting.
+
+Backends are imported by pool workers, so this module must not touch Django models.
+"""
+import re
+from itertools import chain, repeat
+from pathlib import Path
+import numpy as np
+
+
+LEXICON_PATH = Path(__file__).resolve().parent / 'data' / 'lexicon.tsv'
+
+
+class BaseSentimentBackend:
+    """Interface every sentiment backend implements."""
+
+    def polarity(self, text):
+        return self.polarity_batch([text])[0]
+
+    def polarity_batch(self, texts):
+        """Return the polarity of every text in `texts`, in order."""
+        raise NotImplementedError
+
+
+class TextBlobBackend(BaseSentimentBackend):
+    """Reference backend running TextBlob's pattern analyzer one document at a time."""
+
+    def polarity_batch(self, texts):
+        # Imported lazily so that web processes which only queue work never load the NLP stack.
+        from textblob import TextBlob
+        return [TextBlob(text).sentiment.polarity for text in texts]
+
+
+class LexiconBackend(BaseSentimentBackend):
+    """
+    Lexicon scorer that processes a whole batch of documents with NumPy array operations.
+
+    It follows the rules of TextBlob's pattern analyzer on the same lexicon: a document's
+    polarity is the mean polarity of its assessments, an adverb such as "very" scales the
+    word that follows it and forms a single assessment with it, a preceding negation
+    ("not good") multiplies the polarity by -0.5 and an exclamation mark boosts the
+    assessment before it by 25%.
+    """
+    negations = ('no', 'not', 'never')
+    token_re = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*|!")
+
+    def __init__(self, path=LEXICON_PATH):
+        words, polarity, intensity, modifier = [], [], [], []
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                if line.startswith('#') or not line.strip():
+                    continue
+                word, p, i, m = line.rstrip('\n').split('\t')
+                words.append(word)
+                polarity.append(float(p))
+                intensity.append(float(i))
+                modifier.append(m == '1')
+
+        # Negations and '!' get ids after the lexicon words so that every
+        # interesting token can be looked up in the same arrays.
+        self.words = words
+        extra = [w for w in self.negations + ('!',) if w not in words]
+        size = len(words) + len(extra)
+        self.index = {word: pos for pos, word in enumerate(chain(words, extra))}
+        self.known = np.zeros(size, dtype=bool)
+        self.known[:len(words)] = True
+        self.polarities = np.zeros(size)
+        self.polarities[:len(words)] = polarity
+        self.intensities = np.ones(size)
+        self.intensities[:len(words)] = intensity
+        self.modifiers = np.zeros(size, dtype=bool)
+        self.modifiers[:len(words)] = modifier
+        self.adverbs = np.array([w.endswith('ly') for w in chain(words, extra)])
+        self.negates = np.zeros(size, dtype=bool)
+        self.negates[[self.index[w] for w in self.negations]] = True
+        self.exclaims = np.zeros(size, dtype=bool)
+        self.exclaims[self.index['!']] = True
+
+    def tokenize(self, text):
+        # Like TextBlob's tokenizer, "isn't" becomes "is n ' t": contractions don't negate.
+        return self.token_re.findall(text.lower().replace("n't", " n't"))
+
+    def polarity_batch(self, texts):
+        docs = [self.tokenize(text) for text in texts]
+        lengths = np.fromiter(map(len, docs), dtype=np.int64, count=len(docs))
+        tokens = list(chain.from_iterable(docs))
+        if not tokens:
+            return [0.0] * len(docs)
+
+        ids = np.fromiter(map(self.index.get, tokens, repeat(-1)), dtype=np.int64, count=len(tokens))
+        doc = np.repeat(np.arange(len(docs)), lengths)
+        found = ids >= 0
+        ids = np.where(found, ids, 0)
+        known = found & self.known[ids]
+        polarity = np.where(known, self.polarities[ids], 0.0)
+        intensity = np.where(known, self.intensities[ids], 1.0)
+        modifier = known & self.modifiers[ids]
+        adverb = known & self.adverbs[ids]
+        negates = found & self.negates[ids]
+        exclaims = found & self.exclaims[ids]
+        size = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        small = ~known & (size <= 2)
+        positions = np.arange(len(tokens))
+
+        def last_before(mask):
+            """Position of the closest token before k in the same document where `mask` holds, or -1."""
+            seen = np.maximum.accumulate(np.where(mask, positions, -1))
+            out = np.full(len(tokens), -1)
+            out[1:] = seen[:-1]
+            return np.where((out >= 0) & (doc[np.maximum(out, 0)] == doc), out, -1)
+
+        # "not good" and "not a good" are negated; a negated word inverts its intensity.
+        before = last_before(~(small & (size <= 1)))
+        negated = known & (before >= 0) & negates[np.maximum(before, 0)]
+        intensity = np.where(negated, 1.0 / np.where(intensity == 0, 1.0, intensity), intensity)
+
+        # "very good", "really is a good" and "really not good": the known word joins the
+        # assessment of the modifier before it, scaled by the modifier's intensity.
+        # Small unknown words in between are skipped.
+        before = last_before(~small)
+        prior = np.maximum(before, 0)
+        before_2 = np.where(before >= 0, before[prior], -1)
+        prior_2 = np.maximum(before_2, 0)
+        modified_1 = (before >= 0) & modifier[prior]
+        modified_2 = (before_2 >= 0) & negates[prior] & adverb[prior_2]
+        merged = known & (modified_1 | modified_2)
+        scale = np.where(modified_1, intensity[prior], intensity[prior_2])
+        polarity = np.where(merged, np.clip(polarity * scale, -1.0, 1.0), polarity)
+
+        # Every known word that was not merged starts an assessment (a group of tokens);
+        # the assessment's polarity is the one of its last word.
+        starts = known & ~merged
+        group = np.cumsum(starts) - 1
+        words = np.flatnonzero(known)
+        last = np.ones(len(words), dtype=bool)
+        last[:-1] = group[words[1:]] != group[words[:-1]]
+        ends = words[last]
+        scores = polarity[ends]
+
+        # "good!" is a little more positive, for every '!' following the assessment.
+        marks = np.flatnonzero(exclaims)
+        marks = marks[group[marks] >= 0]
+        owner = group[marks]
+        boosted = (doc[ends[owner]] == doc[marks]) & (ends[owner] < marks)
+        boosts = np.bincount(owner[boosted], minlength=len(ends))
+        scores = np.clip(scores * 1.25 ** boosts, -1.0, 1.0)
+
+        is_negated = np.bincount(group[negated], minlength=len(ends)) > 0
+        scores = np.where(is_negated, scores * -0.5, scores)
+
+        totals = np.bincount(doc[ends], weights=scores, minlength=len(docs))
+        counts = np.bincount(doc[ends], minlength=len(docs))
+        return (totals / np.maximum(counts, 1)).tolist()
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router
+from .models import SentimentResult
+
+
+STATS_KEY_PREFIX = 'sentiment_cache'
+STATS = ('memory_hits', 'store_hits', 'misses')
+
+
+class SentimentCache:
+    """
+    Polarity cache keyed by content hash, shared by the Article and Newsletter paths.
+    Entries are paragraphs: documents are scored and cached paragraph by paragraph.
+
+    Lookups go to a bounded in-process LRU first and then to the persisted
+    SentimentResult table, so content that has been scored once is never analysed
+    again. Polarity rather than the label is stored, so changing the thresholds in
+    sentiment.analysis does not invalidate anything.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached polarity for `key`, or None when it has never been scored."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """
+        Return a {key: polarity} dict for the keys of `keys` that have been scored,
+        reading the ones missing from memory with a single query.
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+        memory_hits = len(found)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            stored = dict(SentimentResult.objects
+                          .filter(content_hash__in=missing)
+                          .values_list('content_hash', 'polarity'))
+            for key, polarity in stored.items():
+                self._remember(key, polarity)
+            found.update(stored)
+
+        self._record('memory_hits', memory_hits)
+        self._record('store_hits', len(found) - memory_hits)
+        self._record('misses', len(missing) - (len(found) - memory_hits))
+        return found
+
+    def set(self, key, polarity):
+        SentimentResult.objects.update_or_create(content_hash=key, defaults={'polarity': polarity})
+        self._remember(key, polarity)
+
+    def set_many(self, results):
+        """Persist many (content hash, polarity) pairs with a single bulk upsert."""
+        results = dict(results)
+        features = connections[router.db_for_write(SentimentResult)].features
+        # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target and Django
+        # rejects unique_fields there; content_hash is its only unique key anyway.
+        target = {'unique_fields': ['content_hash']} if features.supports_update_conflicts_with_target else {}
+        SentimentResult.objects.bulk_create(
+            [SentimentResult(content_hash=key, polarity=polarity) for key, polarity in results.items()],
+            update_conflicts=True,
+            update_fields=['polarity'],
+            **target,
+        )
+        for key, polarity in results.items():
+            self._remember(key, polarity)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, polarity):
+        with self._lock:
+            self._entries[key] = polarity
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _record(self, name, count=1):
+        # Counters live in the shared Django cache so web and worker processes add up.
+        if not count:
+            return
+        key = f'{STATS_KEY_PREFIX}:{name}'
+        if not cache.add(key, count, timeout=None):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                cache.set(key, count, timeout=None)
+
+    def stats(self):
+        counters = cache.get_many([f'{STATS_KEY_PREFIX}:{name}' for name in STATS])
+        stats = {name: counters.get(f'{STATS_KEY_PREFIX}:{name}', 0) for name in STATS}
+        lookups = sum(stats.values())
+        stats['hit_ratio'] = (stats['memory_hits'] + stats['store_hits']) / lookups if lookups else 0.0
+        stats['memory_entries'] = len(self._entries)
+        return stats
+
+    def reset_stats(self):
+        cache.delete_many([f'{STATS_KEY_PREFIX}:{name}' for name in STATS])
+
+
+sentiment_cache = SentimentCache(getattr(settings, 'SENTIMENT_CACHE_SIZE', 10000))
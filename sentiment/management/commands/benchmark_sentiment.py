@@ -0,0 +1,66 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from sentiment.analysis import label_for
+from sentiment.backends import LexiconBackend, TextBlobBackend
+
+
+FILLER = ('the', 'a', 'report', 'said', 'city', 'council', 'on', 'with', 'new',
+          'plan', 'and', 'of', 'residents', 'today', 'market', 'was', 'is', 'it')
+MODIFIERS = ('very', 'really', 'extremely', 'quite', 'pretty')
+NEGATIONS = ('not', 'never', "isn't", 'no')
+
+
+class Command(BaseCommand):
+    help = ('Compare the throughput and labels of the TextBlob and NumPy lexicon '
+            'sentiment backends on a synthetic corpus. Does not touch the database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--docs', type=int, default=2000,
+                            help='Number of documents to score.')
+        parser.add_argument('--words', type=int, default=120,
+                            help='Words per document.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def corpus(self, lexicon, docs, words, seed):
+        rng = random.Random(seed)
+        vocabulary = lexicon.words
+        texts = []
+        for _ in range(docs):
+            out = []
+            while len(out) < words:
+                roll = rng.random()
+                if roll < 0.6:
+                    out.append(rng.choice(FILLER))
+                elif roll < 0.7:
+                    out.extend((rng.choice(NEGATIONS), rng.choice(vocabulary)))
+                elif roll < 0.8:
+                    out.extend((rng.choice(MODIFIERS), rng.choice(vocabulary)))
+                else:
+                    out.append(rng.choice(vocabulary))
+                if rng.random() < 0.08:
+                    out[-1] += rng.choice('.!')
+            texts.append(' '.join(out))
+        return texts
+
+    def run(self, backend, texts):
+        start = time.perf_counter()
+        polarities = backend.polarity_batch(texts)
+        return polarities, time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        lexicon = LexiconBackend()
+        texts = self.corpus(lexicon, options['docs'], options['words'], options['seed'])
+
+        reference, reference_time = self.run(TextBlobBackend(), texts)
+        fast, fast_time = self.run(lexicon, texts)
+
+        agree = sum(label_for(a) == label_for(b) for a, b in zip(reference, fast))
+        mean_diff = sum(abs(a - b) for a, b in zip(reference, fast)) / len(texts)
+
+        self.stdout.write(f"Documents:        {len(texts)} x {options['words']} words")
+        self.stdout.write(f"TextBlob:         {len(texts) / reference_time:,.0f} docs/s")
+        self.stdout.write(f"Lexicon (NumPy):  {len(texts) / fast_time:,.0f} docs/s")
+        self.stdout.write(f"Speedup:          {reference_time / fast_time:.1f}x")
+        self.stdout.write(f"Label agreement:  {agree / len(texts):.1%}")
+        self.stdout.write(f"Mean |delta|:     {mean_diff:.4f}")
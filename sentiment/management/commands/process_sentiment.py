@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from sentiment.analysis import process_pending
+
+
+class Command(BaseCommand):
+    help = 'Drain the queue of articles and newsletters waiting for sentiment analysis.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Rows scored per model in each batch.')
+        parser.add_argument('--forever', action='store_true',
+                            help='Keep polling for new work instead of exiting once the queue is empty.')
+        parser.add_argument('--sleep', type=float, default=5.0,
+                            help='Seconds to wait between polls when running with --forever.')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed = process_pending(options['batch_size'])
+            total += processed
+            if processed:
+                self.stdout.write(f'Scored {processed} rows ({total} so far).')
+                continue
+            if not options['forever']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f'Sentiment queue drained, {total} rows scored.'))
@@ -0,0 +1,101 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from hyper_news.cache import invalidate
+from sentiment.analysis import NEUTRAL, SENTIMENT_MODELS, get_backend_path, label_for
+from sentiment.cache import sentiment_cache
+from sentiment.scoring import score_documents
+
+
+class Command(BaseCommand):
+    help = ('Re-score the sentiment of every article and newsletter in parallel, '
+            'e.g. after changing the thresholds or the analyzer.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of scoring processes (defaults to the number of CPUs).')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Rows read, scored and written back per chunk.')
+        parser.add_argument('--checkpoint', default='.sentiment_rescore.json',
+                            help='File recording the last primary key written for each model.')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore an existing checkpoint and start from the first row.')
+
+    def handle(self, *args, **options):
+        checkpoint_path = options['checkpoint']
+        checkpoint = {} if options['restart'] else self.load_checkpoint(checkpoint_path)
+
+        started = time.monotonic()
+        total = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            for label in SENTIMENT_MODELS:
+                model = apps.get_model(label)
+                total += self.rescore(model, label, pool, options, checkpoint, checkpoint_path)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Re-scored {total} rows in {elapsed:.1f}s ({self.rate(total, elapsed)} rows/s).'
+        ))
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    def rescore(self, model, label, pool, options, checkpoint, checkpoint_path):
+        """Stream `model` in primary-key chunks through the pool, keeping the workers busy."""
+        started = time.monotonic()
+        done = 0
+        in_flight = deque()
+        chunks = self.chunks(model, checkpoint.get(label, 0), options['chunk_size'])
+
+        for pks, texts in chunks:
+            in_flight.append((pks, texts, pool.submit(score_documents, texts, get_backend_path())))
+            if len(in_flight) >= options['workers'] * 2:
+                done += self.write_back(model, label, in_flight.popleft(), checkpoint, checkpoint_path)
+        while in_flight:
+            done += self.write_back(model, label, in_flight.popleft(), checkpoint, checkpoint_path)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(f'{model.__name__}: {done} rows ({self.rate(done, elapsed)} rows/s).')
+        return done
+
+    def chunks(self, model, last_pk, chunk_size):
+        while True:
+            rows = list(model.objects.filter(pk__gt=last_pk)
+                        .order_by('pk')
+                        .values_list('pk', 'content')[:chunk_size])
+            if not rows:
+                return
+            last_pk = rows[-1][0]
+            yield [pk for pk, _ in rows], [content for _, content in rows]
+
+    def write_back(self, model, label, chunk, checkpoint, checkpoint_path):
+        """
+        Store one scored chunk and advance the checkpoint past it. Chunks are written
+        in primary-key order, so resuming from the checkpoint never skips rows.
+        """
+        pks, texts, future = chunk
+        results, polarities = future.result()
+        sentiment_cache.set_many(results)
+        objs = [model(pk=pk, sentiment=label_for(polarity) if text else NEUTRAL)
+                for pk, text, polarity in zip(pks, texts, polarities)]
+        model.objects.bulk_update(objs, ['sentiment'])
+        invalidate(model)
+
+        checkpoint[label] = pks[-1]
+        with open(checkpoint_path, 'w') as fh:
+            json.dump(checkpoint, fh)
+        return len(objs)
+
+    def load_checkpoint(self, path):
+        if not os.path.exists(path):
+            return {}
+        with open(path) as fh:
+            checkpoint = json.load(fh)
+        self.stdout.write(f'Resuming from checkpoint {path}: {checkpoint}')
+        return checkpoint
+
+    def rate(self, rows, elapsed):
+        return f'{rows / elapsed:.0f}' if elapsed else '-'
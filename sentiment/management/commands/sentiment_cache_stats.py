@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from sentiment.cache import sentiment_cache
+from sentiment.models import SentimentResult
+
+
+class Command(BaseCommand):
+    help = 'Show the hit/miss counters of the content-hash sentiment cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = sentiment_cache.stats()
+        self.stdout.write(f"Memory hits:    {stats['memory_hits']}")
+        self.stdout.write(f"Store hits:     {stats['store_hits']}")
+        self.stdout.write(f"Misses:         {stats['misses']}")
+        self.stdout.write(f"Hit ratio:      {stats['hit_ratio']:.1%}")
+        self.stdout.write(f"Stored results: {SentimentResult.objects.count()}")
+        if options['reset']:
+            sentiment_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -0,0 +1,12 @@
+from django.db import models
+
+
+# Create your models here.
+class SentimentResult(models.Model):
+    """Persisted polarity of a piece of content, keyed by the SHA-256 of its text."""
+    content_hash = models.CharField(max_length=64, unique=True)
+    polarity = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"hash:{self.content_hash[:12]} polarity:{self.polarity:.3f}"
@@ -0,0 +1,66 @@
+"""
+Pure scoring functions with no Django model dependencies, so they can run inside
+worker processes of a process pool.
+"""
+import hashlib
+import re
+from functools import lru_cache
+from django.utils.module_loading import import_string
+
+
+DEFAULT_BACKEND = 'sentiment.backends.TextBlobBackend'
+
+PARAGRAPH_BREAK = re.compile(r'\s*\n\s*')
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def split_paragraphs(text):
+    """Return the non-blank paragraphs (lines) of `text`, stripped."""
+    return [paragraph for paragraph in PARAGRAPH_BREAK.split(text.strip()) if paragraph]
+
+
+def paragraph_weight(paragraph):
+    return len(paragraph.split())
+
+
+def combine(polarities, weights):
+    """Combine paragraph polarities into the polarity of the document, weighted by length."""
+    total = sum(weights)
+    if not total:
+        return 0.0
+    return sum(polarity * weight for polarity, weight in zip(polarities, weights)) / total
+
+
+@lru_cache(maxsize=None)
+def get_backend(path=DEFAULT_BACKEND):
+    """Return the (process-wide) instance of the backend class at dotted `path`."""
+    return import_string(path)()
+
+
+def score(text, backend=DEFAULT_BACKEND):
+    """Return the polarity of `text`."""
+    return get_backend(backend).polarity(text)
+
+
+def score_batch(texts, backend=DEFAULT_BACKEND):
+    """Return a (content hash, polarity) pair for every text in `texts`."""
+    polarities = get_backend(backend).polarity_batch(texts)
+    return [(content_hash(text), polarity) for text, polarity in zip(texts, polarities)]
+
+
+def score_documents(texts, backend=DEFAULT_BACKEND):
+    """
+    Score every paragraph of `texts` in a single batch.
+    Returns the (content hash, polarity) pairs of the distinct paragraphs and the
+    combined polarity of every document.
+    """
+    documents = [split_paragraphs(text) for text in texts]
+    paragraphs = list(dict.fromkeys(p for paragraphs in documents for p in paragraphs))
+    results = score_batch(paragraphs, backend)
+    polarities = dict(zip(paragraphs, (polarity for _, polarity in results)))
+    combined = [combine([polarities[p] for p in paragraphs], [paragraph_weight(p) for p in paragraphs])
+                for paragraphs in documents]
+    return results, combined
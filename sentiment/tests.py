@@ -0,0 +1,80 @@
+from unittest import mock
+from django.db import connection
+from django.test import TestCase
+from accounts.models import CustomUser
+from article.models import Article
+from . import analysis
+from .cache import SentimentCache, sentiment_cache
+from .models import SentimentResult
+
+
+class SentimentCacheTests(TestCase):
+    def setUp(self):
+        self.cache = SentimentCache(max_entries=10)
+
+    def test_set_many_inserts_and_updates(self):
+        SentimentResult.objects.create(content_hash='a', polarity=0.0)
+        self.cache.set_many([('a', 0.5), ('b', -0.5)])
+        self.assertEqual(dict(SentimentResult.objects.values_list('content_hash', 'polarity')),
+                         {'a': 0.5, 'b': -0.5})
+        self.cache.clear()
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': 0.5, 'b': -0.5})
+
+    def test_set_many_without_conflict_target(self):
+        # Backends such as MySQL upsert on any unique key and reject unique_fields.
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+                mock.patch.object(SentimentResult.objects, 'bulk_create') as bulk_create:
+            self.cache.set_many([('a', 0.5)])
+        kwargs = bulk_create.call_args.kwargs
+        self.assertNotIn('unique_fields', kwargs)
+        self.assertEqual(kwargs['update_conflicts'], True)
+        self.assertEqual(kwargs['update_fields'], ['polarity'])
+        self.assertEqual(self.cache.get('a'), 0.5)
+
+
+class PolarityTests(TestCase):
+    def setUp(self):
+        sentiment_cache.clear()
+
+    def test_only_new_paragraphs_are_scored(self):
+        with mock.patch.object(analysis, 'score_batch', wraps=analysis.score_batch) as score_batch:
+            analysis.analyze('What a wonderful day.\nThe council met.')
+            analysis.analyze('What a wonderful day.\nThe council met again.')
+        self.assertEqual([call.args[0] for call in score_batch.call_args_list],
+                         [['What a wonderful day.', 'The council met.'], ['The council met again.']])
+        self.assertEqual(SentimentResult.objects.count(), 3)
+
+    def test_analyze_without_conflict_target(self):
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+                mock.patch.object(SentimentResult.objects, 'bulk_create') as bulk_create:
+            self.assertEqual(analysis.analyze('What a wonderful day.'), analysis.POSITIVE)
+        self.assertNotIn('unique_fields', bulk_create.call_args.kwargs)
+
+
+class ProcessPendingTests(TestCase):
+    def setUp(self):
+        sentiment_cache.clear()
+        journalist = CustomUser.objects.create_user('journalist', password='pass', position='journalist')
+        self.article = Article.objects.create(title='Title', description='d', content='What a wonderful day.',
+                                              publisher=journalist, journalist=journalist)
+        self.assertEqual(self.article.sentiment, analysis.PENDING)
+
+    def test_pending_rows_are_labelled(self):
+        self.assertEqual(analysis.process_pending(), 1)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.sentiment, analysis.POSITIVE)
+        self.assertEqual(analysis.process_pending(), 0)
+
+    def test_rows_edited_while_scoring_stay_queued(self):
+        def edit_then_analyze(text):
+            Article.objects.filter(pk=self.article.pk).update(content='A terrible, awful day.')
+            return analyze(text)
+
+        analyze = analysis.analyze
+        with mock.patch.object(analysis, 'analyze', side_effect=edit_then_analyze):
+            analysis.process_pending()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.sentiment, analysis.PENDING)
+        analysis.process_pending()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.sentiment, analysis.NEGATIVE)